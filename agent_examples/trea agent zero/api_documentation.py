@@ -9,10 +9,13 @@ import yaml
 import asyncio
 import aiohttp
 import time
-import statistics
+import math
+import collections
+from array import array
+import numpy as np
 from typing import Dict, List, Optional, Any, Union, Callable, Type
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 import structlog
@@ -23,7 +26,7 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field, validator
 import pytest
 import requests
-from jinja2 import Template, Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader
 import markdown
 from prometheus_client import Counter, Histogram, Gauge, generate_latest
 import uuid
@@ -39,6 +42,28 @@ import openapi_spec_validator
 from openapi_spec_validator.readers import read_from_filename
 from openapi_spec_validator.validation.exceptions import OpenAPIValidationError
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Prefer the LibYAML C emitter when PyYAML was built with it
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+UTC = timezone.utc
+
+
+def orjson_dumps(obj: Any, **kwargs) -> str:
+    """json.dumps-compatible wrapper around orjson for Jinja's tojson filter"""
+    
+    option = orjson.OPT_NON_STR_KEYS
+    if kwargs.get('indent'):
+        option |= orjson.OPT_INDENT_2
+    if kwargs.get('sort_keys'):  # Jinja's default dumps_kwargs ask for sorted keys
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, option=option).decode()
+
 
 class TestType(Enum):
     """Test types"""
@@ -121,6 +146,10 @@ class TestResult:
     performance_metrics: Dict[str, float] = field(default_factory=dict)
 
 
+# Field names resolved once for report serialization
+TEST_RESULT_FIELDS = tuple(f.name for f in fields(TestResult))
+
+
 @dataclass
 class LoadTestConfig:
     """Load test configuration"""
@@ -130,6 +159,7 @@ class LoadTestConfig:
     requests_per_second: int = 100
     think_time_seconds: float = 1.0
     scenarios: List[Dict[str, Any]] = field(default_factory=list)
+    streaming_statistics: bool = False  # Constant-memory estimates for soak tests
 
 
 @dataclass
@@ -570,13 +600,120 @@ class DocumentationGenerator:
         )
 
 
+class P2QuantileEstimator:
+    """Streaming quantile estimator (P² algorithm) using five markers"""
+    
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5]
+        self.increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+    
+    def update(self, value: float):
+        """Add an observation"""
+        
+        self.count += 1
+        heights = self.heights
+        
+        if self.count <= 5:
+            heights.append(value)
+            if self.count == 5:
+                heights.sort()
+            return
+        
+        # Locate the cell containing the observation, extending the extremes
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+    
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+    
+    def _linear(self, i: int, step: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+    
+    def value(self) -> float:
+        """Current quantile estimate"""
+        
+        if self.count == 0:
+            return math.nan
+        if self.count < 5:
+            ordered = sorted(self.heights)
+            return ordered[min(int(self.quantile * len(ordered)), len(ordered) - 1)]
+        return self.heights[2]
+
+
+class StreamingResponseStats:
+    """Constant-memory response time summary for long-running load tests"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.median = P2QuantileEstimator(0.5)
+        self.p95 = P2QuantileEstimator(0.95)
+    
+    def add(self, value: float):
+        """Record a response time"""
+        
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.median.update(value)
+        self.p95.update(value)
+
+
 class APITestRunner:
     """API test execution engine"""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, max_connections: int = 100,
+                 keepalive_timeout: float = 30.0):
         self.base_url = base_url
         self.logger = structlog.get_logger(__name__)
-        self.session = aiohttp.ClientSession()
+        
+        # Keep-alive pool shared by every test and load-test request
+        connector = aiohttp.TCPConnector(
+            limit=max_connections,
+            limit_per_host=max_connections,
+            keepalive_timeout=keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
         self.test_results: List[TestResult] = []
         
         # Setup metrics
@@ -594,8 +731,8 @@ class APITestRunner:
     async def run_test_case(self, test_case: TestCase) -> TestResult:
         """Execute a single test case"""
         
-        start_time = time.time()
-        timestamp = datetime.utcnow()
+        start_time = time.monotonic()
+        timestamp = datetime.now(UTC)
         
         try:
             # Prepare request
@@ -645,7 +782,7 @@ class APITestRunner:
             # Determine test status
             status = TestStatus.PASSED if all(a['passed'] for a in assertions) else TestStatus.FAILED
             
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             result = TestResult(
                 test_case_id=test_case.id,
@@ -671,7 +808,7 @@ class APITestRunner:
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             
             result = TestResult(
                 test_case_id=test_case.id,
@@ -740,24 +877,21 @@ class APITestRunner:
             
             async def run_with_semaphore(test_case):
                 async with semaphore:
-                    return await self.run_test_case(test_case)
+                    try:
+                        return await self.run_test_case(test_case)
+                    except Exception as e:
+                        return TestResult(
+                            test_case_id=test_case.id,
+                            status=TestStatus.ERROR,
+                            execution_time=0,
+                            timestamp=datetime.now(UTC),
+                            error_message=str(e)
+                        )
             
-            tasks = [run_with_semaphore(tc) for tc in test_cases]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(run_with_semaphore(tc)) for tc in test_cases]
             
-            # Handle exceptions
-            test_results = []
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    test_results.append(TestResult(
-                        test_case_id=test_cases[i].id,
-                        status=TestStatus.ERROR,
-                        execution_time=0,
-                        timestamp=datetime.utcnow(),
-                        error_message=str(result)
-                    ))
-                else:
-                    test_results.append(result)
+            test_results = [task.result() for task in tasks]
         else:
             # Run tests sequentially
             test_results = []
@@ -771,47 +905,89 @@ class APITestRunner:
     async def run_load_test(self, test_case: TestCase, config: LoadTestConfig) -> Dict[str, Any]:
         """Run load test"""
         
-        results = []
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + config.duration_seconds
         
         # Create semaphore for concurrent users
         semaphore = asyncio.Semaphore(config.concurrent_users)
         
+        # Soak tests summarize response times as they arrive instead of
+        # buffering every sample
+        streaming_stats = StreamingResponseStats() if config.streaming_statistics else None
+        
         async def load_test_worker():
+            # Keep only what the statistics need: a request count and a
+            # contiguous buffer of successful response times
+            request_count = 0
+            passed_times = array('d')
+            record_time = streaming_stats.add if streaming_stats else passed_times.append
+            passed = TestStatus.PASSED
+            run_test_case = self.run_test_case
+            
             async with semaphore:
-                while time.time() - start_time < config.duration_seconds:
-                    result = await self.run_test_case(test_case)
-                    results.append(result)
+                while loop.time() < deadline:
+                    result = await run_test_case(test_case)
+                    request_count += 1
+                    if result.status is passed:
+                        record_time(result.execution_time)
                     
                     # Think time
                     if config.think_time_seconds > 0:
                         await asyncio.sleep(config.think_time_seconds)
+            
+            return request_count, passed_times
         
         # Start workers
         workers = [load_test_worker() for _ in range(config.concurrent_users)]
-        await asyncio.gather(*workers, return_exceptions=True)
+        worker_results = await asyncio.gather(*workers, return_exceptions=True)
+        elapsed = loop.time() - start_time
+        
+        total_requests = 0
+        response_times = array('d')
+        for worker_result in worker_results:
+            if isinstance(worker_result, Exception):
+                continue
+            request_count, passed_times = worker_result
+            total_requests += request_count
+            response_times.extend(passed_times)
         
         # Calculate statistics
-        response_times = [r.execution_time for r in results if r.status == TestStatus.PASSED]
-        
-        if response_times:
+        if streaming_stats and streaming_stats.count:
             stats = {
-                'total_requests': len(results),
+                'total_requests': total_requests,
+                'successful_requests': streaming_stats.count,
+                'failed_requests': total_requests - streaming_stats.count,
+                'success_rate': streaming_stats.count / total_requests * 100,
+                'avg_response_time': streaming_stats.total / streaming_stats.count,
+                'min_response_time': streaming_stats.minimum,
+                'max_response_time': streaming_stats.maximum,
+                'median_response_time': streaming_stats.median.value(),
+                'p95_response_time': streaming_stats.p95.value(),
+                'requests_per_second': total_requests / elapsed
+            }
+        elif response_times:
+            times = np.frombuffer(response_times, dtype=np.float64)
+            min_time, median_time, p95_time, max_time = np.percentile(
+                times, [0, 50, 95, 100], method='lower'
+            )
+            stats = {
+                'total_requests': total_requests,
                 'successful_requests': len(response_times),
-                'failed_requests': len(results) - len(response_times),
-                'success_rate': len(response_times) / len(results) * 100,
-                'avg_response_time': statistics.mean(response_times),
-                'min_response_time': min(response_times),
-                'max_response_time': max(response_times),
-                'median_response_time': statistics.median(response_times),
-                'p95_response_time': statistics.quantiles(response_times, n=20)[18] if len(response_times) > 20 else max(response_times),
-                'requests_per_second': len(results) / (time.time() - start_time)
+                'failed_requests': total_requests - len(response_times),
+                'success_rate': len(response_times) / total_requests * 100,
+                'avg_response_time': float(times.mean()),
+                'min_response_time': float(min_time),
+                'max_response_time': float(max_time),
+                'median_response_time': float(median_time),
+                'p95_response_time': float(p95_time),
+                'requests_per_second': total_requests / elapsed
             }
         else:
             stats = {
-                'total_requests': len(results),
+                'total_requests': total_requests,
                 'successful_requests': 0,
-                'failed_requests': len(results),
+                'failed_requests': total_requests,
                 'success_rate': 0,
                 'requests_per_second': 0
             }
@@ -823,35 +999,7 @@ class APITestRunner:
         await self.session.close()
 
 
-class TestReportGenerator:
-    """Test report generator"""
-    
-    def __init__(self):
-        self.logger = structlog.get_logger(__name__)
-    
-    def generate_html_report(self, test_results: List[TestResult], 
-                           test_cases: List[TestCase]) -> str:
-        """Generate HTML test report"""
-        
-        # Calculate summary statistics
-        total_tests = len(test_results)
-        passed_tests = sum(1 for r in test_results if r.status == TestStatus.PASSED)
-        failed_tests = sum(1 for r in test_results if r.status == TestStatus.FAILED)
-        error_tests = sum(1 for r in test_results if r.status == TestStatus.ERROR)
-        
-        success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        # Group results by test type
-        results_by_type = {}
-        for result in test_results:
-            test_case = next((tc for tc in test_cases if tc.id == result.test_case_id), None)
-            if test_case:
-                test_type = test_case.test_type.value
-                if test_type not in results_by_type:
-                    results_by_type[test_type] = []
-                results_by_type[test_type].append(result)
-        
-        html_template = """
+TEST_REPORT_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -950,7 +1098,7 @@ class TestReportGenerator:
                             </tr>
                         </thead>
                         <tbody>
-                            {% for result in test_results %}
+                            {% for result, result_timestamp in test_rows %}
                             <tr>
                                 <td>{{ result.test_case_id }}</td>
                                 <td>
@@ -959,14 +1107,17 @@ class TestReportGenerator:
                                     </span>
                                 </td>
                                 <td>{{ "%.3f"|format(result.execution_time) }}s</td>
-                                <td>{{ result.timestamp.strftime('%Y-%m-%d %H:%M:%S') }}</td>
+                                <td>{{ result_timestamp }}</td>
                                 <td>
+                                    {% if result.error_message or result.assertions or result.response_data %}
                                     <button class="btn btn-sm btn-outline-primary" 
                                             onclick="toggleDetails('{{ result.test_case_id }}')">
                                         Details
                                     </button>
+                                    {% endif %}
                                 </td>
                             </tr>
+                            {% if result.error_message or result.assertions or result.response_data %}
                             <tr id="details-{{ result.test_case_id }}" class="test-details">
                                 <td colspan="5">
                                     <div class="p-3 bg-light">
@@ -997,6 +1148,7 @@ class TestReportGenerator:
                                     </div>
                                 </td>
                             </tr>
+                            {% endif %}
                             {% endfor %}
                         </tbody>
                     </table>
@@ -1044,42 +1196,131 @@ class TestReportGenerator:
         
         function toggleDetails(testId) {
             const details = document.getElementById('details-' + testId);
+            if (!details) return;
             details.style.display = details.style.display === 'none' ? 'table-row' : 'none';
         }
     </script>
 </body>
 </html>
-        """
+"""
+
+
+class TestReportGenerator:
+    """Test report generator"""
+    
+    def __init__(self):
+        self.logger = structlog.get_logger(__name__)
+        
+        # Encode per-row response bodies with orjson when it is installed
+        self.jinja_env = Environment()
+        if ORJSON_AVAILABLE:
+            self.jinja_env.policies['json.dumps_function'] = orjson_dumps
+            self.jinja_env.policies['json.dumps_kwargs'] = {}
+        
+        self.html_template = self.jinja_env.from_string(TEST_REPORT_TEMPLATE)
+    
+    def generate_html_report(self, test_results: List[TestResult], 
+                           test_cases: List[TestCase]) -> str:
+        """Generate HTML test report"""
+        
+        context = self._build_html_context(test_results, test_cases)
+        return self.html_template.render(**context)
+    
+    def generate_html_report_to(self, path: Union[str, Path], test_results: List[TestResult],
+                                test_cases: List[TestCase]):
+        """Stream HTML test report to a file without materializing the document"""
+        
+        context = self._build_html_context(test_results, test_cases)
+        with open(path, 'w') as f:
+            self.html_template.stream(**context).dump(f)
+    
+    def _build_html_context(self, test_results: List[TestResult], 
+                            test_cases: List[TestCase]) -> Dict[str, Any]:
+        """Build the template context for the HTML test report"""
+        
+        # Calculate summary statistics
+        status_counts = collections.Counter(r.status for r in test_results)
+        total_tests = len(test_results)
+        passed_tests = status_counts[TestStatus.PASSED]
+        failed_tests = status_counts[TestStatus.FAILED]
+        error_tests = status_counts[TestStatus.ERROR]
         
-        template = Template(html_template)
+        success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
         
         response_times = [r.execution_time for r in test_results]
         
-        return template.render(
-            timestamp=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
-            total_tests=total_tests,
-            passed_tests=passed_tests,
-            failed_tests=failed_tests,
-            error_tests=error_tests,
-            success_rate=round(success_rate, 2),
-            test_results=test_results,
-            response_times=response_times
-        )
+        # Format row timestamps lazily here instead of calling strftime from
+        # the template for every row; the explicit format keeps tz-aware
+        # timestamps free of a "+00:00" suffix
+        test_rows = ((r, r.timestamp.strftime('%Y-%m-%d %H:%M:%S')) for r in test_results)
+        
+        return {
+            'timestamp': datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S'),
+            'total_tests': total_tests,
+            'passed_tests': passed_tests,
+            'failed_tests': failed_tests,
+            'error_tests': error_tests,
+            'success_rate': round(success_rate, 2),
+            'test_rows': test_rows,
+            'response_times': response_times
+        }
     
     def generate_json_report(self, test_results: List[TestResult]) -> Dict[str, Any]:
         """Generate JSON test report"""
         
+        report = self._build_json_summary(test_results)
+        report["results"] = [self._result_to_dict(result) for result in test_results]
+        return report
+    
+    def generate_json_report_bytes(self, test_results: List[TestResult]) -> bytes:
+        """Generate encoded JSON test report, using orjson when available"""
+        
+        report = self._build_json_summary(test_results)
+        
+        if ORJSON_AVAILABLE:
+            # orjson serializes dataclasses, enums and datetimes natively
+            report["results"] = test_results
+            return orjson.dumps(
+                report,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        
+        report["results"] = [self._result_to_dict(result) for result in test_results]
+        return json.dumps(report, indent=2, default=self._json_default).encode()
+    
+    def _build_json_summary(self, test_results: List[TestResult]) -> Dict[str, Any]:
+        """Build the summary section of the JSON test report"""
+        
+        status_counts = collections.Counter(r.status for r in test_results)
+        
         return {
             "summary": {
                 "total_tests": len(test_results),
-                "passed": sum(1 for r in test_results if r.status == TestStatus.PASSED),
-                "failed": sum(1 for r in test_results if r.status == TestStatus.FAILED),
-                "errors": sum(1 for r in test_results if r.status == TestStatus.ERROR),
-                "success_rate": sum(1 for r in test_results if r.status == TestStatus.PASSED) / len(test_results) * 100 if test_results else 0
+                "passed": status_counts[TestStatus.PASSED],
+                "failed": status_counts[TestStatus.FAILED],
+                "errors": status_counts[TestStatus.ERROR],
+                "success_rate": status_counts[TestStatus.PASSED] / len(test_results) * 100 if test_results else 0
             },
-            "results": [asdict(result) for result in test_results],
-            "generated_at": datetime.utcnow().isoformat()
+            "generated_at": datetime.now(UTC).isoformat()
         }
+    
+    def _result_to_dict(self, result: TestResult) -> Dict[str, Any]:
+        """Shallow field-by-field conversion of a test result"""
+        
+        data = {name: getattr(result, name) for name in TEST_RESULT_FIELDS}
+        data['timestamp'] = result.timestamp.isoformat()
+        return data
+    
+    @staticmethod
+    def _json_default(obj: Any) -> Any:
+        """Fallback encoder for values the stdlib json module rejects"""
+        
+        if isinstance(obj, Enum):
+            return obj.value
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        return str(obj)
 
 
 class APIDocumentationSystem:
@@ -1098,6 +1339,7 @@ class APIDocumentationSystem:
         # Storage
         self.endpoints: List[APIEndpoint] = []
         self.test_cases: List[TestCase] = []
+        self.test_cases_by_id: Dict[str, TestCase] = {}
         self.test_results: List[TestResult] = []
     
     def add_endpoint(self, endpoint: APIEndpoint):
@@ -1108,6 +1350,7 @@ class APIDocumentationSystem:
     def add_test_case(self, test_case: TestCase):
         """Add test case"""
         self.test_cases.append(test_case)
+        self.test_cases_by_id[test_case.id] = test_case
     
     def generate_documentation(self, output_dir: str = "docs"):
         """Generate complete API documentation"""
@@ -1125,10 +1368,14 @@ class APIDocumentationSystem:
         
         # Save OpenAPI spec
         with open(output_path / "openapi.yaml", 'w') as f:
-            yaml.dump(openapi_spec, f, default_flow_style=False)
+            yaml.dump(openapi_spec, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False)
         
-        with open(output_path / "openapi.json", 'w') as f:
-            json.dump(openapi_spec, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(output_path / "openapi.json", 'wb') as f:
+                f.write(orjson.dumps(openapi_spec, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path / "openapi.json", 'w') as f:
+                json.dump(openapi_spec, f, indent=2)
         
         # Generate HTML documentation
         html_doc = self.doc_generator.generate_html_documentation(openapi_spec, self.endpoints)
@@ -1149,45 +1396,53 @@ class APIDocumentationSystem:
             "validation_errors": validation_errors
         }
     
-    async def run_tests(self, base_url: str, parallel: bool = True) -> Dict[str, Any]:
-        """Run all test cases"""
+    async def _get_test_runner(self, base_url: str) -> APITestRunner:
+        """Return the shared test runner, recreating it if the base URL changed"""
+        
+        if self.test_runner and self.test_runner.base_url != base_url:
+            await self.test_runner.close()
+            self.test_runner = None
         
         if not self.test_runner:
             self.test_runner = APITestRunner(base_url)
         
-        try:
-            results = await self.test_runner.run_test_suite(self.test_cases, parallel)
-            self.test_results.extend(results)
-            
-            # Generate reports
-            html_report = self.report_generator.generate_html_report(results, self.test_cases)
-            json_report = self.report_generator.generate_json_report(results)
-            
-            return {
-                "results": results,
-                "html_report": html_report,
-                "json_report": json_report
-            }
-            
-        finally:
-            await self.test_runner.close()
+        return self.test_runner
+    
+    async def run_tests(self, base_url: str, parallel: bool = True) -> Dict[str, Any]:
+        """Run all test cases"""
+        
+        test_runner = await self._get_test_runner(base_url)
+        
+        results = await test_runner.run_test_suite(self.test_cases, parallel)
+        self.test_results.extend(results)
+        
+        # Generate reports
+        html_report = self.report_generator.generate_html_report(results, self.test_cases)
+        json_report = self.report_generator.generate_json_report(results)
+        
+        return {
+            "results": results,
+            "html_report": html_report,
+            "json_report": json_report
+        }
     
     async def run_load_test(self, base_url: str, test_case_id: str, 
                            config: LoadTestConfig) -> Dict[str, Any]:
         """Run load test for specific endpoint"""
         
-        test_case = next((tc for tc in self.test_cases if tc.id == test_case_id), None)
+        test_case = self.test_cases_by_id.get(test_case_id)
         if not test_case:
             raise ValueError(f"Test case {test_case_id} not found")
         
-        if not self.test_runner:
-            self.test_runner = APITestRunner(base_url)
+        test_runner = await self._get_test_runner(base_url)
         
-        try:
-            stats = await self.test_runner.run_load_test(test_case, config)
-            return stats
-        finally:
+        return await test_runner.run_load_test(test_case, config)
+    
+    async def aclose(self):
+        """Close the shared test runner and its connection pool"""
+        if self.test_runner:
             await self.test_runner.close()
+            self.test_runner = None
 
 
 # Example usage
@@ -1272,5 +1527,6 @@ if __name__ == "__main__":
         # Run tests (if server is running)
         # test_result = await doc_system.run_tests("http://localhost:8000")
         # print(f"Tests completed: {len(test_result['results'])} tests run")
+        # await doc_system.aclose()
     
     asyncio.run(main())
\ No newline at end of file
@@ -10,19 +10,27 @@ import logging
 import time
 import hashlib
 import hmac
+import re
 import jwt
-from typing import Dict, List, Optional, Any, Callable, Union, Tuple
+from typing import Dict, List, Optional, Any, Callable, Union, Tuple, Iterator
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import random
+import bisect
+import heapq
+import itertools
+import zlib
 import aiohttp
+import httpx
 import aioredis
+from multidict import CIMultiDict
 from fastapi import FastAPI, Request, Response, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import uvicorn
 from prometheus_client import Counter, Histogram, Gauge
 import structlog
@@ -31,6 +39,48 @@ import etcd3
 from circuit_breaker import CircuitBreaker
 import yaml
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def stable_hash(value: str) -> int:
+    """Process-independent string hash (unlike the seeded built-in hash())"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(value)
+    return zlib.crc32(value.encode())
+
+
+# Virtual nodes per instance on the consistent-hash ring used by IP hashing
+HASH_RING_VNODES = 150
+
+# Upstream bodies are relayed to the client in chunks of this size
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Hop-specific headers dropped when relaying requests and responses
+SKIPPED_REQUEST_HEADERS = frozenset({'host'})
+SKIPPED_RESPONSE_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+# Upper bound in seconds on the retry delay of failing background loops
+MAX_LOOP_BACKOFF = 60.0
+
+# Prefer the LibYAML C emitter when PyYAML was built with it
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
 class LoadBalancingStrategy(Enum):
     """Load balancing strategies"""
@@ -62,12 +112,38 @@ class ServiceInstance:
     healthy: bool = True
     connections: int = 0
     response_time: float = 0.0
-    last_health_check: Optional[datetime] = None
+    last_health_check: Optional[float] = None  # Epoch seconds
     metadata: Dict[str, Any] = field(default_factory=dict)
+    current_weight: int = field(default=0, repr=False)  # Smooth weighted round robin state
+    scheme: str = "http"
+    service: Optional["ServiceConfig"] = field(default=None, repr=False, compare=False)
     
     @property
     def url(self) -> str:
-        return f"http://{self.host}:{self.port}"
+        return f"{self.scheme}://{self.host}:{self.port}"
+    
+    def acquire_connection(self):
+        """Count a request routed to this instance"""
+        # Only the event loop thread touches the counter and neither helper
+        # awaits, so the read-modify-write cannot interleave
+        self.connections += 1
+        if self.service:
+            self.service.refresh_instance(self)
+    
+    def release_connection(self):
+        """Release a request previously counted by acquire_connection"""
+        if self.connections > 0:
+            self.connections -= 1
+            if self.service:
+                self.service.refresh_instance(self)
+
+
+# Ordering keys for the strategies that pick the "least loaded" instance
+SELECTION_KEYS: Dict[LoadBalancingStrategy, Callable[[ServiceInstance], Any]] = {
+    LoadBalancingStrategy.LEAST_CONNECTIONS: lambda inst: (inst.connections, inst.response_time),
+    LoadBalancingStrategy.LEAST_RESPONSE_TIME: lambda inst: inst.response_time,
+    LoadBalancingStrategy.HEALTH_BASED: lambda inst: inst.response_time + (inst.connections * 0.1),
+}
 
 
 @dataclass
@@ -75,7 +151,7 @@ class ServiceConfig:
     """Service configuration"""
     name: str
     path_prefix: str
-    instances: List[ServiceInstance] = field(default_factory=list)
+    instances: Dict[str, ServiceInstance] = field(default_factory=dict)  # keyed by instance id
     load_balancing_strategy: LoadBalancingStrategy = LoadBalancingStrategy.ROUND_ROBIN
     health_check_path: str = "/health"
     health_check_interval: int = 30
@@ -85,6 +161,79 @@ class ServiceConfig:
     rate_limit: Optional[Dict[str, Any]] = None
     authentication_required: bool = True
     allowed_methods: List[str] = field(default_factory=lambda: ["GET", "POST", "PUT", "DELETE"])
+    
+    # Derived routing state, refreshed only when instances or their health change
+    healthy_instances: List[ServiceInstance] = field(default_factory=list, init=False, repr=False)
+    total_weight: int = field(default=0, init=False, repr=False)
+    hash_ring_keys: List[int] = field(default_factory=list, init=False, repr=False)
+    hash_ring_instances: List[ServiceInstance] = field(default_factory=list, init=False, repr=False)
+    
+    # Min-heap of (key, sequence, instance) for least-loaded strategies; stale
+    # entries are skipped lazily because every key change pushes a fresh one
+    selection_heap: List[Tuple[Any, int, ServiceInstance]] = field(default_factory=list, init=False, repr=False)
+    _heap_sequence: Iterator[int] = field(default_factory=itertools.count, init=False, repr=False)
+    _healthy_ids: set = field(default_factory=set, init=False, repr=False)
+    
+    def rebuild_healthy_instances(self):
+        """Recompute the healthy instance list, its total weight and hash ring"""
+        self.healthy_instances = [inst for inst in self.instances.values() if inst.healthy]
+        self.total_weight = sum(inst.weight for inst in self.healthy_instances)
+        
+        ring = sorted(
+            ((stable_hash(f"{inst.id}#{vnode}"), inst)
+             for inst in self.healthy_instances
+             for vnode in range(HASH_RING_VNODES)),
+            key=lambda entry: entry[0]
+        )
+        self.hash_ring_keys = [key for key, _ in ring]
+        self.hash_ring_instances = [inst for _, inst in ring]
+        
+        self._rebuild_selection_heap()
+    
+    def _rebuild_selection_heap(self):
+        """Rebuild the least-loaded heap from the healthy instances"""
+        selection_key = SELECTION_KEYS.get(self.load_balancing_strategy)
+        if selection_key is None:
+            self.selection_heap = []
+            return
+        
+        for inst in self.instances.values():
+            inst.service = self
+        
+        self._healthy_ids = {id(inst) for inst in self.healthy_instances}
+        self.selection_heap = [
+            (selection_key(inst), next(self._heap_sequence), inst)
+            for inst in self.healthy_instances
+        ]
+        heapq.heapify(self.selection_heap)
+    
+    def refresh_instance(self, instance: ServiceInstance):
+        """Record a change to an instance's load metrics"""
+        selection_key = SELECTION_KEYS.get(self.load_balancing_strategy)
+        if selection_key is None or id(instance) not in self._healthy_ids:
+            return
+        
+        heapq.heappush(
+            self.selection_heap,
+            (selection_key(instance), next(self._heap_sequence), instance)
+        )
+        
+        # Compact once stale entries dominate the heap
+        if len(self.selection_heap) > 4 * len(self.healthy_instances) + 16:
+            self._rebuild_selection_heap()
+    
+    def least_loaded_instance(self) -> Optional[ServiceInstance]:
+        """Return the healthy instance with the smallest selection key"""
+        selection_key = SELECTION_KEYS[self.load_balancing_strategy]
+        heap = self.selection_heap
+        
+        while heap:
+            key, _, inst = heap[0]
+            if id(inst) in self._healthy_ids and key == selection_key(inst):
+                return inst
+            heapq.heappop(heap)
+        
+        return None
 
 
 @dataclass
@@ -94,6 +243,7 @@ class RateLimitRule:
     limit: int  # requests per window
     window: int  # window size in seconds
     burst: int = 0  # burst allowance
+    strategy: str = "fixed_counter"  # "fixed_counter" or "sliding_log"
 
 
 @dataclass
@@ -106,6 +256,31 @@ class AuthConfig:
     api_keys: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     oauth2_config: Dict[str, Any] = field(default_factory=dict)
     custom_auth_handler: Optional[Callable] = None
+    
+    # API keys indexed by keyed fingerprint, so lookups never compare raw keys
+    key_pepper: bytes = field(default_factory=lambda: os.urandom(32), repr=False)
+    key_index: Dict[bytes, Dict[str, Any]] = field(default_factory=dict, init=False, repr=False)
+    
+    def __post_init__(self):
+        for api_key, key_info in self.api_keys.items():
+            self.key_index[self.fingerprint(api_key)] = {
+                **key_info,
+                '_exp_epoch': self._expiry_epoch(key_info.get('expires_at'))
+            }
+    
+    @staticmethod
+    def _expiry_epoch(expires_at: Optional[str]) -> Optional[float]:
+        """Convert an ISO expiry (naive values are UTC) to epoch seconds"""
+        if not expires_at:
+            return None
+        expiry = datetime.fromisoformat(expires_at)
+        if expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return expiry.timestamp()
+    
+    def fingerprint(self, api_key: str) -> bytes:
+        """HMAC-SHA256 fingerprint of an API key"""
+        return hmac.new(self.key_pepper, api_key.encode(), hashlib.sha256).digest()
 
 
 class ServiceDiscovery:
@@ -117,6 +292,12 @@ class ServiceDiscovery:
         self.logger = structlog.get_logger(__name__)
         self._client = None
         self._setup_client()
+        
+        # Discovery results per service as (expires_at, instances); empty
+        # results expire sooner so a service coming up is noticed quickly
+        self._cache: Dict[str, Tuple[float, List[ServiceInstance]]] = {}
+        self._cache_ttl = self.config.get('cache_ttl', 300)
+        self._negative_cache_ttl = self.config.get('negative_cache_ttl', 30)
     
     def _setup_client(self):
         """Setup service discovery client"""
@@ -155,7 +336,8 @@ class ServiceDiscovery:
                     "metadata": instance.metadata
                 })
                 self._client.put(key, value)
-                
+            
+            self.invalidate(service.name)
             self.logger.info(
                 "Service registered",
                 service=service.name,
@@ -171,13 +353,20 @@ class ServiceDiscovery:
                 error=str(e)
             )
     
-    async def discover_services(self, service_name: str) -> List[ServiceInstance]:
-        """Discover service instances"""
+    async def discover_services(self, service_name: str) -> Optional[List[ServiceInstance]]:
+        """Discover service instances, or None if the backend lookup failed"""
+        cached = self._cached(service_name)
+        if cached is not None:
+            return cached
+        
         try:
             instances = []
             
             if self.discovery_type == "consul":
-                _, services = self._client.health.service(service_name, passing=True)
+                # The Consul client blocks, so run it off the event loop
+                _, services = await asyncio.to_thread(
+                    self._client.health.service, service_name, passing=True
+                )
                 for service in services:
                     instance = ServiceInstance(
                         id=service['Service']['ID'],
@@ -191,16 +380,9 @@ class ServiceDiscovery:
             elif self.discovery_type == "etcd":
                 prefix = f"/services/{service_name}/"
                 for value, metadata in self._client.get_prefix(prefix):
-                    service_data = json.loads(value.decode())
-                    instance = ServiceInstance(
-                        id=metadata.key.decode().split('/')[-1],
-                        host=service_data['host'],
-                        port=service_data['port'],
-                        weight=service_data.get('weight', 1),
-                        metadata=service_data.get('metadata', {})
-                    )
-                    instances.append(instance)
+                    instances.append(self._etcd_instance(value, metadata))
             
+            self._store(service_name, instances)
             return instances
             
         except Exception as e:
@@ -209,7 +391,72 @@ class ServiceDiscovery:
                 service=service_name,
                 error=str(e)
             )
-            return []
+            # Not cached, and distinct from "no instances" so callers keep
+            # what they already have during a backend outage
+            return None
+    
+    async def discover_all_services(self, service_names: List[str]) -> Dict[str, List[ServiceInstance]]:
+        """Discover instances for several services, batching backend calls where possible"""
+        if self.discovery_type != "etcd":
+            # One query per service, all in flight at once
+            results = await asyncio.gather(
+                *(self.discover_services(name) for name in service_names),
+                return_exceptions=True
+            )
+            return {
+                name: result
+                for name, result in zip(service_names, results)
+                if result is not None and not isinstance(result, BaseException)
+            }
+        
+        # etcd: a single prefix scan covers every registered service, so
+        # only scan when at least one of them has no fresh cached result
+        cached = {name: self._cached(name) for name in service_names}
+        if all(instances is not None for instances in cached.values()):
+            return cached
+        
+        discovered: Dict[str, List[ServiceInstance]] = {name: [] for name in service_names}
+        try:
+            for value, metadata in self._client.get_prefix("/services/"):
+                # Keys look like /services/<service>/<instance>
+                service_name = metadata.key.decode().split('/')[2]
+                if service_name in discovered:
+                    discovered[service_name].append(self._etcd_instance(value, metadata))
+        except Exception as e:
+            self.logger.error("Failed to discover services", error=str(e))
+            return {}
+        
+        for service_name, instances in discovered.items():
+            self._store(service_name, instances)
+        
+        return discovered
+    
+    def _cached(self, service_name: str) -> Optional[List[ServiceInstance]]:
+        """Return unexpired cached instances for a service, if any"""
+        entry = self._cache.get(service_name)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def _store(self, service_name: str, instances: List[ServiceInstance]):
+        """Cache a discovery result"""
+        ttl = self._cache_ttl if instances else self._negative_cache_ttl
+        self._cache[service_name] = (time.monotonic() + ttl, instances)
+    
+    def invalidate(self, service_name: str):
+        """Drop the cached result for a service so the next lookup hits the backend"""
+        self._cache.pop(service_name, None)
+    
+    def _etcd_instance(self, value: bytes, metadata: Any) -> ServiceInstance:
+        """Build a service instance from an etcd registration entry"""
+        service_data = json.loads(value.decode())
+        return ServiceInstance(
+            id=metadata.key.decode().split('/')[-1],
+            host=service_data['host'],
+            port=service_data['port'],
+            weight=service_data.get('weight', 1),
+            metadata=service_data.get('metadata', {})
+        )
     
     async def deregister_service(self, service_name: str, instance_id: str):
         """Deregister a service instance"""
@@ -219,7 +466,8 @@ class ServiceDiscovery:
             elif self.discovery_type == "etcd":
                 key = f"/services/{service_name}/{instance_id}"
                 self._client.delete(key)
-                
+            
+            self.invalidate(service_name)
             self.logger.info(
                 "Service deregistered",
                 service=service_name,
@@ -240,90 +488,120 @@ class LoadBalancer:
     
     def __init__(self):
         self.logger = structlog.get_logger(__name__)
-        self._round_robin_counters: Dict[str, int] = {}
+        # Monotonic per-service ticks, advanced once per actual selection
+        self._round_robin_counters: Dict[str, Iterator[int]] = {}
+        
+        # Strategy implementations share the (service, instances, client_ip) signature
+        self._dispatch: Dict[LoadBalancingStrategy, Callable[..., ServiceInstance]] = {
+            LoadBalancingStrategy.ROUND_ROBIN: self._round_robin,
+            LoadBalancingStrategy.WEIGHTED_ROUND_ROBIN: self._weighted_round_robin,
+            LoadBalancingStrategy.LEAST_CONNECTIONS: self._least_connections,
+            LoadBalancingStrategy.LEAST_RESPONSE_TIME: self._least_response_time,
+            LoadBalancingStrategy.IP_HASH: self._ip_hash,
+            LoadBalancingStrategy.RANDOM: self._random,
+            LoadBalancingStrategy.HEALTH_BASED: self._health_based,
+        }
     
     def select_instance(self, service: ServiceConfig, client_ip: str = None) -> Optional[ServiceInstance]:
         """Select a service instance based on load balancing strategy"""
-        healthy_instances = [inst for inst in service.instances if inst.healthy]
+        healthy_instances = service.healthy_instances
         
         if not healthy_instances:
             return None
         
-        strategy = service.load_balancing_strategy
-        
-        if strategy == LoadBalancingStrategy.ROUND_ROBIN:
-            return self._round_robin(service.name, healthy_instances)
-        elif strategy == LoadBalancingStrategy.WEIGHTED_ROUND_ROBIN:
-            return self._weighted_round_robin(service.name, healthy_instances)
-        elif strategy == LoadBalancingStrategy.LEAST_CONNECTIONS:
-            return self._least_connections(healthy_instances)
-        elif strategy == LoadBalancingStrategy.LEAST_RESPONSE_TIME:
-            return self._least_response_time(healthy_instances)
-        elif strategy == LoadBalancingStrategy.IP_HASH:
-            return self._ip_hash(healthy_instances, client_ip)
-        elif strategy == LoadBalancingStrategy.RANDOM:
-            return self._random(healthy_instances)
-        elif strategy == LoadBalancingStrategy.HEALTH_BASED:
-            return self._health_based(healthy_instances)
-        else:
-            return self._round_robin(service.name, healthy_instances)
+        select = self._dispatch.get(service.load_balancing_strategy, self._round_robin)
+        instance = select(service, healthy_instances, client_ip)
+        
+        # Count the request as soon as it is routed so concurrent selections
+        # see it; the caller releases it when the request completes
+        instance.acquire_connection()
+        return instance
     
-    def _round_robin(self, service_name: str, instances: List[ServiceInstance]) -> ServiceInstance:
+    def _round_robin(self, service: ServiceConfig, instances: List[ServiceInstance],
+                     client_ip: str = None) -> ServiceInstance:
         """Round robin load balancing"""
-        if service_name not in self._round_robin_counters:
-            self._round_robin_counters[service_name] = 0
-        
-        index = self._round_robin_counters[service_name] % len(instances)
-        self._round_robin_counters[service_name] += 1
+        counter = self._round_robin_counters.get(service.name)
+        if counter is None:
+            counter = self._round_robin_counters[service.name] = itertools.count()
         
-        return instances[index]
+        return instances[next(counter) % len(instances)]
     
-    def _weighted_round_robin(self, service_name: str, instances: List[ServiceInstance]) -> ServiceInstance:
-        """Weighted round robin load balancing"""
-        total_weight = sum(inst.weight for inst in instances)
-        
-        if service_name not in self._round_robin_counters:
-            self._round_robin_counters[service_name] = 0
-        
-        target = self._round_robin_counters[service_name] % total_weight
-        self._round_robin_counters[service_name] += 1
-        
-        current_weight = 0
+    def _weighted_round_robin(self, service: ServiceConfig, instances: List[ServiceInstance],
+                              client_ip: str = None) -> ServiceInstance:
+        """Weighted round robin load balancing (nginx smooth weighted round robin)"""
+        best = None
         for instance in instances:
-            current_weight += instance.weight
-            if target < current_weight:
-                return instance
+            instance.current_weight += instance.weight
+            if best is None or instance.current_weight > best.current_weight:
+                best = instance
         
-        return instances[0]
+        best.current_weight -= service.total_weight
+        return best
     
-    def _least_connections(self, instances: List[ServiceInstance]) -> ServiceInstance:
+    def _least_connections(self, service: ServiceConfig, instances: List[ServiceInstance],
+                           client_ip: str = None) -> ServiceInstance:
         """Least connections load balancing"""
-        return min(instances, key=lambda inst: inst.connections)
+        return service.least_loaded_instance() or min(instances, key=SELECTION_KEYS[service.load_balancing_strategy])
     
-    def _least_response_time(self, instances: List[ServiceInstance]) -> ServiceInstance:
+    def _least_response_time(self, service: ServiceConfig, instances: List[ServiceInstance],
+                             client_ip: str = None) -> ServiceInstance:
         """Least response time load balancing"""
-        return min(instances, key=lambda inst: inst.response_time)
+        return service.least_loaded_instance() or min(instances, key=SELECTION_KEYS[service.load_balancing_strategy])
     
-    def _ip_hash(self, instances: List[ServiceInstance], client_ip: str) -> ServiceInstance:
+    def _ip_hash(self, service: ServiceConfig, instances: List[ServiceInstance],
+                 client_ip: str = None) -> ServiceInstance:
         """IP hash load balancing"""
         if not client_ip:
-            return self._random(instances)
+            return self._random(service, instances)
         
-        hash_value = hash(client_ip)
-        index = hash_value % len(instances)
-        return instances[index]
+        # Consistent hashing keeps client affinity across restarts and only
+        # remaps the share of a removed or recovered instance
+        index = bisect.bisect(service.hash_ring_keys, stable_hash(client_ip))
+        if index == len(service.hash_ring_keys):
+            index = 0
+        return service.hash_ring_instances[index]
     
-    def _random(self, instances: List[ServiceInstance]) -> ServiceInstance:
+    def _random(self, service: ServiceConfig, instances: List[ServiceInstance],
+                client_ip: str = None) -> ServiceInstance:
         """Random load balancing"""
         return random.choice(instances)
     
-    def _health_based(self, instances: List[ServiceInstance]) -> ServiceInstance:
+    def _health_based(self, service: ServiceConfig, instances: List[ServiceInstance],
+                      client_ip: str = None) -> ServiceInstance:
         """Health-based load balancing (prefer instances with better health scores)"""
         # Simple implementation: prefer instances with lower response time and fewer connections
-        def health_score(inst):
-            return inst.response_time + (inst.connections * 0.1)
-        
-        return min(instances, key=health_score)
+        return service.least_loaded_instance() or min(instances, key=SELECTION_KEYS[service.load_balancing_strategy])
+
+
+# Sliding-log check-and-record executed atomically on the Redis server.
+# KEYS[1] = log key; ARGV = now (ms), window (ms), limit, member
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, count + 1}
+end
+
+return {0, count}
+"""
+
+# Fixed-window counter: one INCR per request, expiry set when the bucket is
+# created. KEYS[1] = bucket key; ARGV = window (seconds)
+FIXED_WINDOW_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
 
 
 class RateLimiter:
@@ -333,48 +611,67 @@ class RateLimiter:
         self.redis_url = redis_url
         self.redis = None
         self.logger = structlog.get_logger(__name__)
+        self._script_shas: Dict[str, str] = {}
     
     async def initialize(self):
         """Initialize Redis connection"""
         self.redis = await aioredis.from_url(self.redis_url)
+        for script in (SLIDING_WINDOW_SCRIPT, FIXED_WINDOW_SCRIPT):
+            self._script_shas[script] = await self.redis.script_load(script)
+    
+    async def _run_script(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        """Run a rate limit script by SHA, reloading it if Redis lost it"""
+        try:
+            return await self.redis.evalsha(self._script_shas[script], len(keys), *keys, *args)
+        except aioredis.exceptions.NoScriptError:
+            self._script_shas[script] = await self.redis.script_load(script)
+            return await self.redis.eval(script, len(keys), *keys, *args)
     
     async def is_allowed(self, rule: RateLimitRule, identifier: str) -> Tuple[bool, Dict[str, Any]]:
         """Check if request is allowed under rate limit"""
         if not self.redis:
             await self.initialize()
         
-        key = f"rate_limit:{rule.key}:{identifier}"
+        if rule.strategy == "sliding_log":
+            return await self._is_allowed_sliding_log(rule, identifier)
+        return await self._is_allowed_fixed_counter(rule, identifier)
+    
+    async def _is_allowed_fixed_counter(self, rule: RateLimitRule,
+                                        identifier: str) -> Tuple[bool, Dict[str, Any]]:
+        """Fixed-window counter: O(1) Redis work and memory per identifier"""
         current_time = int(time.time())
-        window_start = current_time - rule.window
-        
-        # Use Redis pipeline for atomic operations
-        pipe = self.redis.pipeline()
-        
-        # Remove old entries
-        pipe.zremrangebyscore(key, 0, window_start)
-        
-        # Count current requests
-        pipe.zcard(key)
-        
-        # Add current request
-        pipe.zadd(key, {str(current_time): current_time})
+        bucket = current_time // rule.window
+        key = f"rl:{rule.key}:{identifier}:{bucket}"
         
-        # Set expiration
-        pipe.expire(key, rule.window)
+        # Over-limit requests only inflate the counter for the rest of the
+        # bucket, so no undo is needed
+        current_requests = await self._run_script(FIXED_WINDOW_SCRIPT, [key], [rule.window])
         
-        results = await pipe.execute()
-        current_requests = results[1]
-        
-        # Check if limit exceeded
-        allowed = current_requests < rule.limit
+        return current_requests <= rule.limit, {
+            "limit": rule.limit,
+            "remaining": max(0, rule.limit - current_requests),
+            "reset_time": (bucket + 1) * rule.window,
+            "window": rule.window
+        }
+    
+    async def _is_allowed_sliding_log(self, rule: RateLimitRule,
+                                      identifier: str) -> Tuple[bool, Dict[str, Any]]:
+        """Sliding log: exact rolling window, one sorted-set member per request"""
+        key = f"rate_limit:{rule.key}:{identifier}"
+        now_ms = int(time.time() * 1000)
+        current_time = now_ms // 1000
+        window_start = current_time - rule.window
         
-        if not allowed:
-            # Remove the request we just added since it's not allowed
-            await self.redis.zrem(key, str(current_time))
+        # Trim, count and record in a single atomic round trip; rejected
+        # requests are never added, so there is nothing to undo
+        member = f"{now_ms}-{random.getrandbits(32)}"
+        allowed, current_requests = await self._run_script(
+            SLIDING_WINDOW_SCRIPT, [key], [now_ms, rule.window * 1000, rule.limit, member]
+        )
         
-        return allowed, {
+        return bool(allowed), {
             "limit": rule.limit,
-            "remaining": max(0, rule.limit - current_requests - 1),
+            "remaining": max(0, rule.limit - current_requests),
             "reset_time": window_start + rule.window,
             "window": rule.window
         }
@@ -383,10 +680,15 @@ class RateLimiter:
 class AuthenticationManager:
     """Authentication and authorization manager"""
     
-    def __init__(self, config: AuthConfig):
+    def __init__(self, config: AuthConfig, jwt_cache_size: int = 10000, jwt_cache_ttl: int = 60):
         self.config = config
         self.logger = structlog.get_logger(__name__)
         self.security = HTTPBearer()
+        
+        # Decoded JWT payloads keyed by a token digest: (payload, cached_until)
+        self._jwt_cache: Dict[bytes, Tuple[Dict[str, Any], float]] = {}
+        self._jwt_cache_size = jwt_cache_size
+        self._jwt_cache_ttl = jwt_cache_ttl
     
     async def authenticate(self, request: Request) -> Dict[str, Any]:
         """Authenticate request and return user context"""
@@ -412,13 +714,9 @@ class AuthenticationManager:
             credentials: HTTPAuthorizationCredentials = await self.security(request)
             token = credentials.credentials
             
-            payload = jwt.decode(
-                token,
-                self.config.jwt_secret,
-                algorithms=[self.config.jwt_algorithm]
-            )
+            payload = self._decode_jwt(token)
             
-            # Check expiration
+            # Check expiration (cached payloads may outlive the token)
             if payload.get('exp', 0) < time.time():
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -445,20 +743,46 @@ class AuthenticationManager:
                 detail="Authentication failed"
             )
     
+    def _decode_jwt(self, token: str) -> Dict[str, Any]:
+        """Decode a JWT, reusing the verified payload for repeated tokens"""
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.monotonic()
+        
+        cached = self._jwt_cache.get(cache_key)
+        if cached and cached[1] > now:
+            return cached[0]
+        
+        try:
+            payload = jwt.decode(
+                token,
+                self.config.jwt_secret,
+                algorithms=[self.config.jwt_algorithm]
+            )
+        except jwt.InvalidTokenError:
+            self._jwt_cache.pop(cache_key, None)
+            raise
+        
+        if len(self._jwt_cache) >= self._jwt_cache_size:
+            # Evict the oldest entry (dicts keep insertion order)
+            self._jwt_cache.pop(next(iter(self._jwt_cache)))
+        self._jwt_cache[cache_key] = (payload, now + self._jwt_cache_ttl)
+        
+        return payload
+    
     async def _authenticate_api_key(self, request: Request) -> Dict[str, Any]:
         """API key authentication"""
         api_key = request.headers.get("X-API-Key")
         if not api_key:
             api_key = request.query_params.get("api_key")
         
-        if not api_key or api_key not in self.config.api_keys:
+        # Single keyed-hash probe; raw keys are never compared character by character
+        key_info = self.config.key_index.get(self.config.fingerprint(api_key)) if api_key else None
+        if key_info is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key"
             )
         
-        key_info = self.config.api_keys[api_key]
-        
         # Check if key is active
         if not key_info.get('active', True):
             raise HTTPException(
@@ -467,9 +791,8 @@ class AuthenticationManager:
             )
         
         # Check expiration
-        if key_info.get('expires_at'):
-            expires_at = datetime.fromisoformat(key_info['expires_at'])
-            if datetime.utcnow() > expires_at:
+        if key_info['_exp_epoch']:
+            if time.time() > key_info['_exp_epoch']:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="API key expired"
@@ -505,7 +828,10 @@ class AuthenticationManager:
                             detail="Invalid OAuth2 token"
                         )
                     
-                    user_info = await response.json()
+                    if ORJSON_AVAILABLE:
+                        user_info = orjson.loads(await response.read())
+                    else:
+                        user_info = await response.json()
                     return {
                         "user_id": user_info.get('sub'),
                         "username": user_info.get('username'),
@@ -543,41 +869,49 @@ class AuthenticationManager:
 class HealthChecker:
     """Health checker for service instances"""
     
-    def __init__(self):
+    def __init__(self, session: aiohttp.ClientSession, max_concurrency: int = 64):
         self.logger = structlog.get_logger(__name__)
+        self.session = session
+        self.timeout = aiohttp.ClientTimeout(total=5)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
     
     async def check_health(self, service: ServiceConfig, instance: ServiceInstance) -> bool:
         """Check health of a service instance"""
+        async with self._semaphore:
+            return await self._check_health(service, instance)
+    
+    async def _check_health(self, service: ServiceConfig, instance: ServiceInstance) -> bool:
+        """Probe a service instance's health endpoint"""
         try:
             url = f"{instance.url}{service.health_check_path}"
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                start_time = time.time()
-                async with session.get(url) as response:
-                    response_time = time.time() - start_time
-                    
-                    # Update instance metrics
-                    instance.response_time = response_time
-                    instance.last_health_check = datetime.utcnow()
-                    
-                    # Consider healthy if status is 2xx
-                    healthy = 200 <= response.status < 300
-                    instance.healthy = healthy
-                    
-                    if not healthy:
-                        self.logger.warning(
-                            "Health check failed",
-                            service=service.name,
-                            instance=instance.id,
-                            status_code=response.status,
-                            response_time=response_time
-                        )
-                    
-                    return healthy
-                    
+            start_time = time.time()
+            async with self.session.get(url, timeout=self.timeout) as response:
+                response_time = time.time() - start_time
+                
+                # Update instance metrics
+                instance.response_time = response_time
+                service.refresh_instance(instance)
+                instance.last_health_check = time.time()
+                
+                # Consider healthy if status is 2xx
+                healthy = 200 <= response.status < 300
+                self._set_health(service, instance, healthy)
+                
+                if not healthy:
+                    self.logger.warning(
+                        "Health check failed",
+                        service=service.name,
+                        instance=instance.id,
+                        status_code=response.status,
+                        response_time=response_time
+                    )
+                
+                return healthy
+                
         except Exception as e:
-            instance.healthy = False
-            instance.last_health_check = datetime.utcnow()
+            self._set_health(service, instance, False)
+            instance.last_health_check = time.time()
             
             self.logger.error(
                 "Health check error",
@@ -587,6 +921,12 @@ class HealthChecker:
             )
             
             return False
+    
+    def _set_health(self, service: ServiceConfig, instance: ServiceInstance, healthy: bool):
+        """Update instance health, refreshing the service's routing set on a flip"""
+        if instance.healthy != healthy:
+            instance.healthy = healthy
+            service.rebuild_healthy_instances()
 
 
 class APIGateway:
@@ -594,16 +934,41 @@ class APIGateway:
     
     def __init__(self, config_path: str = "gateway_config.yaml"):
         self.config = self._load_config(config_path)
-        self.app = FastAPI(title="Cognitive AI API Gateway", version="1.0.0")
+        self.app = FastAPI(
+            title="Cognitive AI API Gateway",
+            version="1.0.0",
+            default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+        )
         
         # Initialize components
         self.services: Dict[str, ServiceConfig] = {}
+        self._route_pattern: Optional[re.Pattern] = None
+        self._route_services: Dict[str, ServiceConfig] = {}
+        self._route_cache: Dict[str, Optional[ServiceConfig]] = {}
+        self._route_cache_size = 4096
         self.load_balancer = LoadBalancer()
         self.rate_limiter = RateLimiter(self.config.get('redis_url', 'redis://localhost:6379'))
         self.auth_manager = AuthenticationManager(
             AuthConfig(**self.config.get('authentication', {}))
         )
-        self.health_checker = HealthChecker()
+        
+        # Upstream client for proxied requests; HTTPS instances negotiate
+        # HTTP/2 via ALPN and multiplex concurrent requests per connection
+        self._upstream = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200)
+        )
+        
+        # Shared keep-alive pool for health checks
+        self._http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=1000,
+                limit_per_host=128,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+        )
+        self.health_checker = HealthChecker(self._http)
         self.service_discovery = ServiceDiscovery(
             self.config.get('service_discovery', {}).get('type', 'consul'),
             self.config.get('service_discovery', {}).get('config', {})
@@ -624,10 +989,22 @@ class APIGateway:
         # Background tasks
         self._health_check_task = None
         self._service_discovery_task = None
+        
+        # Set by service discovery whenever instances are added or removed
+        self._instances_dirty = asyncio.Event()
+        
+        # Retry delays for the background loops, doubled on each consecutive
+        # failure up to MAX_LOOP_BACKOFF and reset after a clean pass
+        self._health_check_backoff = 1.0
+        self._discovery_backoff = 1.0
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load gateway configuration"""
         try:
+            # JSON configs skip the YAML parser entirely
+            if config_path.endswith('.json'):
+                with open(config_path, 'rb') as f:
+                    return orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
             with open(config_path, 'r') as f:
                 return yaml.safe_load(f)
         except FileNotFoundError:
@@ -679,12 +1056,47 @@ class APIGateway:
             ['service']
         )
         
+        # Bound metric children keyed by label values, so the hot path skips
+        # prometheus_client's label validation and locking
+        self._request_counters: Dict[Tuple[str, str, int], Any] = {}
+        self._request_timers: Dict[Tuple[str, str], Any] = {}
+        
         self.rate_limit_hits = Counter(
             'gateway_rate_limit_hits_total',
             'Rate limit hits',
             ['service', 'rule']
         )
     
+    def _request_counter(self, service_name: str, method: str, status_code: int):
+        """Return the bound request counter for a label combination"""
+        key = (service_name, method, status_code)
+        counter = self._request_counters.get(key)
+        if counter is None:
+            counter = self._request_counters[key] = self.request_count.labels(
+                service=service_name,
+                method=method,
+                status=status_code
+            )
+        return counter
+    
+    def _request_timer(self, service_name: str, method: str):
+        """Return the bound request duration histogram for a label combination"""
+        key = (service_name, method)
+        timer = self._request_timers.get(key)
+        if timer is None:
+            timer = self._request_timers[key] = self.request_duration.labels(
+                service=service_name,
+                method=method
+            )
+        return timer
+    
+    def _bind_service_metrics(self, service: ServiceConfig):
+        """Pre-bind metric children for a service's common label combinations"""
+        for method in service.allowed_methods:
+            self._request_timer(service.name, method)
+            for status_code in (200, 500):
+                self._request_counter(service.name, method, status_code)
+    
     def _setup_middleware(self):
         """Setup FastAPI middleware"""
         # CORS middleware
@@ -715,7 +1127,7 @@ class APIGateway:
                 "timestamp": datetime.utcnow().isoformat(),
                 "services": {
                     name: {
-                        "healthy_instances": len([i for i in service.instances if i.healthy]),
+                        "healthy_instances": len(service.healthy_instances),
                         "total_instances": len(service.instances)
                     }
                     for name, service in self.services.items()
@@ -761,7 +1173,16 @@ class APIGateway:
             if service.rate_limit:
                 await self._check_rate_limit(request, service)
             
-            # Load balancing
+            # Circuit breaker check
+            circuit_breaker = self._get_circuit_breaker(service.name)
+            if circuit_breaker.state == "open":
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Service temporarily unavailable"
+                )
+            
+            # Load balancing (the selected instance's connection is released
+            # by _proxy_request once the response completes or fails)
             instance = self.load_balancer.select_instance(
                 service,
                 client_ip=request.client.host if request.client else None
@@ -773,33 +1194,16 @@ class APIGateway:
                     detail="No healthy instances available"
                 )
             
-            # Circuit breaker check
-            circuit_breaker = self._get_circuit_breaker(service.name)
-            if circuit_breaker.state == "open":
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Service temporarily unavailable"
-                )
-            
             # Proxy request
             response = await self._proxy_request(request, service, instance, path)
             
             # Update metrics
-            instance.connections -= 1
             circuit_breaker.record_success()
             
             # Record metrics
             duration = time.time() - start_time
-            self.request_count.labels(
-                service=service_name,
-                method=request.method,
-                status=response.status_code
-            ).inc()
-            
-            self.request_duration.labels(
-                service=service_name,
-                method=request.method
-            ).observe(duration)
+            self._request_counter(service_name, request.method, response.status_code).inc()
+            self._request_timer(service_name, request.method).observe(duration)
             
             return response
             
@@ -811,11 +1215,7 @@ class APIGateway:
                 circuit_breaker = self._get_circuit_breaker(service_name)
                 circuit_breaker.record_failure()
                 
-                self.request_count.labels(
-                    service=service_name,
-                    method=request.method,
-                    status=500
-                ).inc()
+                self._request_counter(service_name, request.method, 500).inc()
             
             self.logger.error(
                 "Request handling failed",
@@ -830,10 +1230,38 @@ class APIGateway:
     
     def _find_service(self, path: str) -> Optional[ServiceConfig]:
         """Find service matching the request path"""
-        for service in self.services.values():
-            if path.startswith(service.path_prefix.lstrip('/')):
-                return service
-        return None
+        try:
+            return self._route_cache[path]
+        except KeyError:
+            pass
+        
+        service = None
+        if self._route_pattern is not None:
+            match = self._route_pattern.match(path)
+            if match:
+                service = self._route_services[match.lastgroup]
+        
+        if len(self._route_cache) >= self._route_cache_size:
+            # Evict the oldest entry (dicts keep insertion order)
+            self._route_cache.pop(next(iter(self._route_cache)))
+        self._route_cache[path] = service
+        
+        return service
+    
+    def _rebuild_routes(self):
+        """Compile service path prefixes into a single longest-prefix-first regex"""
+        services = sorted(
+            self.services.values(),
+            key=lambda service: len(service.path_prefix.lstrip('/')),
+            reverse=True
+        )
+        
+        self._route_cache.clear()
+        self._route_services = {f"s{i}": service for i, service in enumerate(services)}
+        self._route_pattern = re.compile('|'.join(
+            f"(?P<{group}>{re.escape(service.path_prefix.lstrip('/'))})"
+            for group, service in self._route_services.items()
+        )) if services else None
     
     async def _check_rate_limit(self, request: Request, service: ServiceConfig):
         """Check rate limiting for request"""
@@ -860,7 +1288,8 @@ class APIGateway:
             key=key_type,
             limit=rate_limit_config.get('limit', 100),
             window=rate_limit_config.get('window', 60),
-            burst=rate_limit_config.get('burst', 0)
+            burst=rate_limit_config.get('burst', 0),
+            strategy=rate_limit_config.get('strategy', 'fixed_counter')
         )
         
         # Check rate limit
@@ -907,54 +1336,79 @@ class APIGateway:
         target_url = f"{instance.url}/{target_path.lstrip('/')}"
         
         # Prepare headers
-        headers = dict(request.headers)
-        headers.pop('host', None)  # Remove host header
+        headers = CIMultiDict(
+            (name, value) for name, value in request.headers.items()
+            if name.lower() not in SKIPPED_REQUEST_HEADERS
+        )
         
         # Add forwarding headers
         headers['X-Forwarded-For'] = request.client.host if request.client else 'unknown'
         headers['X-Forwarded-Proto'] = request.url.scheme
         headers['X-Forwarded-Host'] = request.headers.get('host', 'unknown')
         
-        # Update connection count
-        instance.connections += 1
+        response = None
         
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=service.timeout)) as session:
-                # Prepare request data
-                data = None
-                if request.method in ['POST', 'PUT', 'PATCH']:
-                    data = await request.body()
-                
-                # Make request
-                async with session.request(
-                    method=request.method,
-                    url=target_url,
-                    headers=headers,
-                    params=dict(request.query_params),
-                    data=data
-                ) as response:
-                    # Read response
-                    content = await response.read()
-                    
-                    # Prepare response headers
-                    response_headers = dict(response.headers)
-                    response_headers.pop('content-encoding', None)
-                    response_headers.pop('content-length', None)
-                    response_headers.pop('transfer-encoding', None)
-                    
-                    return Response(
-                        content=content,
-                        status_code=response.status,
-                        headers=response_headers,
-                        media_type=response.headers.get('content-type')
-                    )
-                    
-        except asyncio.TimeoutError:
+            # Prepare request data
+            data = None
+            if request.method in ['POST', 'PUT', 'PATCH']:
+                data = await request.body()
+            
+            # Make request; the response stays open while its body streams
+            upstream_request = self._upstream.build_request(
+                method=request.method,
+                url=target_url,
+                headers=headers,
+                params=dict(request.query_params),
+                content=data,
+                timeout=service.timeout
+            )
+            response = await self._upstream.send(upstream_request, stream=True)
+            
+            # Prepare response headers
+            response_headers = CIMultiDict(
+                (name, value) for name, value in response.headers.multi_items()
+                if name.lower() not in SKIPPED_RESPONSE_HEADERS
+            )
+            
+            upstream = response
+            response = None  # Ownership passes to the streaming response
+            released = False
+            
+            async def release_upstream():
+                # Runs from the body stream and the background task; whichever
+                # comes first closes the stream and releases the connection
+                nonlocal released
+                if not released:
+                    released = True
+                    await upstream.aclose()
+                    instance.release_connection()
+            
+            async def stream_body():
+                try:
+                    async for chunk in upstream.aiter_bytes(PROXY_CHUNK_SIZE):
+                        yield chunk
+                finally:
+                    await release_upstream()
+            
+            # The background task also runs when the body is never iterated,
+            # e.g. if the client disconnects before streaming starts
+            return StreamingResponse(
+                stream_body(),
+                status_code=upstream.status_code,
+                headers=response_headers,
+                media_type=upstream.headers.get('content-type'),
+                background=BackgroundTask(release_upstream)
+            )
+            
+        except httpx.TimeoutException:
+            await self._release_failed_proxy(instance, response)
             raise HTTPException(
                 status_code=status.HTTP_504_GATEWAY_TIMEOUT,
                 detail="Service timeout"
             )
         except Exception as e:
+            await self._release_failed_proxy(instance, response)
             self.logger.error(
                 "Proxy request failed",
                 service=service.name,
@@ -966,8 +1420,13 @@ class APIGateway:
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail="Service unavailable"
             )
-        finally:
-            instance.connections -= 1
+    
+    async def _release_failed_proxy(self, instance: ServiceInstance,
+                                    response: Optional[httpx.Response]):
+        """Undo connection bookkeeping for a proxy attempt that never streamed"""
+        if response is not None:
+            await response.aclose()
+        instance.release_connection()
     
     async def start(self):
         """Start the API gateway"""
@@ -988,6 +1447,9 @@ class APIGateway:
         if self._service_discovery_task:
             self._service_discovery_task.cancel()
         
+        await self._upstream.aclose()
+        await self._http.close()
+        
         self.logger.info("API Gateway stopped")
     
     async def _load_services(self):
@@ -1018,48 +1480,116 @@ class APIGateway:
                     host=instance_config['host'],
                     port=instance_config['port'],
                     weight=instance_config.get('weight', 1),
-                    metadata=instance_config.get('metadata', {})
+                    metadata=instance_config.get('metadata', {}),
+                    scheme=instance_config.get('scheme', 'http')
                 )
-                service.instances.append(instance)
+                service.instances[instance.id] = instance
             
+            service.rebuild_healthy_instances()
+            self._bind_service_metrics(service)
             self.services[service.name] = service
+        
+        self._rebuild_routes()
     
     async def _health_check_loop(self):
-        """Background health checking loop"""
-        while True:
-            try:
-                tasks = []
-                for service in self.services.values():
-                    for instance in service.instances:
-                        tasks.append(
-                            self.health_checker.check_health(service, instance)
-                        )
-                
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-            except Exception as e:
-                self.logger.error("Health check loop error", error=str(e))
-                await asyncio.sleep(5)
+        """Background health checking loop
+        
+        Every instance is probed on its own jittered schedule, held in a heap of
+        (due_time, sequence, service_name, instance_id). The loop sleeps until the
+        next probe is due or until discovery reports a change in the instance set.
+        """
+        loop = asyncio.get_running_loop()
+        schedule: List[Tuple[float, int, str, str]] = []
+        scheduled: set = set()
+        sequence = itertools.count()
+        services = self.services
+        probe = self._probe_instance
+        push = heapq.heappush
+        
+        # Probes run in a task group, which holds their references and
+        # cancels any still in flight when this loop is cancelled
+        async with asyncio.TaskGroup() as probes:
+            spawn = probes.create_task
+            while True:
+                try:
+                    self._instances_dirty.clear()
+                    now = loop.time()
+                    
+                    # Newly seen instances are probed straight away
+                    unseen = [
+                        (service_name, instance_id)
+                        for service_name, service in services.items()
+                        for instance_id in service.instances
+                        if (service_name, instance_id) not in scheduled
+                    ]
+                    scheduled.update(unseen)
+                    for key in unseen:
+                        push(schedule, (now, next(sequence), *key))
+                    
+                    # Launch due probes and reschedule each with +/-10% jitter so
+                    # instances drift apart instead of being probed in bursts
+                    while schedule and schedule[0][0] <= now:
+                        _, _, service_name, instance_id = heapq.heappop(schedule)
+                        service = services.get(service_name)
+                        instance = service and service.instances.get(instance_id)
+                        if instance is None:
+                            scheduled.discard((service_name, instance_id))
+                            continue
+                        
+                        spawn(probe(service, instance))
+                        interval = service.health_check_interval * random.uniform(0.9, 1.1)
+                        push(schedule, (now + interval, next(sequence), service_name, instance_id))
+                    
+                    self._health_check_backoff = 1.0
+                    
+                    timeout = schedule[0][0] - now if schedule else None
+                    try:
+                        await asyncio.wait_for(self._instances_dirty.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    
+                except Exception as e:
+                    self.logger.error("Health check loop error", error=str(e),
+                                      retry_in=self._health_check_backoff)
+                    await asyncio.sleep(self._health_check_backoff)
+                    self._health_check_backoff = min(self._health_check_backoff * 2, MAX_LOOP_BACKOFF)
+    
+    async def _probe_instance(self, service: ServiceConfig, instance: ServiceInstance):
+        """Health-check one instance without letting a failure reach the task group"""
+        try:
+            healthy = await self.health_checker.check_health(service, instance)
+        except Exception as e:
+            self.logger.error("Health probe error", service=service.name,
+                              instance=instance.id, error=str(e))
+            healthy = False
+        
+        if not healthy:
+            # A failing instance may have been deregistered; rediscover promptly
+            self.service_discovery.invalidate(service.name)
     
     async def _service_discovery_loop(self):
         """Background service discovery loop"""
         while True:
             try:
+                discovered = await self.service_discovery.discover_all_services(list(self.services))
+                
                 for service in self.services.values():
-                    # Discover new instances
-                    discovered_instances = await self.service_discovery.discover_services(service.name)
+                    # Leave services whose lookup failed outright untouched
+                    discovered_instances = discovered.get(service.name)
+                    if discovered_instances is None:
+                        continue
                     
                     # Update service instances
-                    existing_ids = {inst.id for inst in service.instances}
+                    existing_ids = service.instances.keys()
                     discovered_ids = {inst.id for inst in discovered_instances}
+                    removed_ids = existing_ids - discovered_ids
+                    changed = bool(removed_ids)
                     
                     # Add new instances
                     for instance in discovered_instances:
                         if instance.id not in existing_ids:
-                            service.instances.append(instance)
+                            service.instances[instance.id] = instance
+                            changed = True
                             self.logger.info(
                                 "New service instance discovered",
                                 service=service.name,
@@ -1067,20 +1597,26 @@ class APIGateway:
                             )
                     
                     # Remove instances that are no longer discovered
-                    service.instances = [
-                        inst for inst in service.instances
-                        if inst.id in discovered_ids
-                    ]
+                    for instance_id in removed_ids:
+                        service.instances.pop(instance_id, None)
+                    
+                    # A stable topology leaves the routing state as it is
+                    if changed:
+                        service.rebuild_healthy_instances()
+                        self._instances_dirty.set()
                 
+                self._discovery_backoff = 1.0
                 await asyncio.sleep(60)  # Discover every minute
                 
             except Exception as e:
-                self.logger.error("Service discovery loop error", error=str(e))
-                await asyncio.sleep(10)
+                self.logger.error("Service discovery loop error", error=str(e),
+                                  retry_in=self._discovery_backoff)
+                await asyncio.sleep(self._discovery_backoff)
+                self._discovery_backoff = min(self._discovery_backoff * 2, MAX_LOOP_BACKOFF)
 
 
-def create_gateway_config():
-    """Create example gateway configuration"""
+def create_gateway_config(output_format: str = "yaml"):
+    """Create example gateway configuration (written as YAML or JSON)"""
     config = {
         "host": "0.0.0.0",
         "port": 8080,
@@ -1195,8 +1731,15 @@ def create_gateway_config():
         ]
     }
     
-    with open("gateway_config.yaml", 'w') as f:
-        yaml.dump(config, f, default_flow_style=False)
+    if output_format == "json":
+        with open("gateway_config.json", 'wb') as f:
+            if ORJSON_AVAILABLE:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(config, indent=2).encode())
+    else:
+        with open("gateway_config.yaml", 'w') as f:
+            yaml.dump(config, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False)
     
     return config
 
@@ -1207,8 +1750,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="API Gateway")
     parser.add_argument("--create-config", action="store_true",
                        help="Create example gateway configuration")
+    parser.add_argument("--format", choices=["yaml", "json"], default="yaml",
+                       help="Format of the configuration created by --create-config")
     parser.add_argument("--config", type=str, default="gateway_config.yaml",
-                       help="Path to gateway configuration file")
+                       help="Path to gateway configuration file (.yaml or .json)")
     parser.add_argument("--host", type=str, default="0.0.0.0",
                        help="Host to bind to")
     parser.add_argument("--port", type=int, default=8080,
@@ -1217,8 +1762,8 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     if args.create_config:
-        config = create_gateway_config()
-        print("Gateway configuration created: gateway_config.yaml")
+        config = create_gateway_config(args.format)
+        print(f"Gateway configuration created: gateway_config.{args.format}")
     else:
         # Run gateway
         async def main():
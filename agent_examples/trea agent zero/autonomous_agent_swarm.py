@@ -17,8 +17,8 @@ This module provides:
 import asyncio
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Union, Tuple, Callable, Set
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Union, Tuple, Callable, Set, FrozenSet, Iterable
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 import logging
 import time
@@ -27,7 +27,8 @@ from datetime import datetime, timedelta
 import uuid
 import pickle
 import threading
-import queue
+import heapq
+import itertools
 import random
 import math
 from collections import deque, defaultdict
@@ -55,6 +56,30 @@ try:
 except ImportError:
     DASK_AVAILABLE = False
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import rustworkx as rx
+    RUSTWORKX_AVAILABLE = True
+except ImportError:
+    RUSTWORKX_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # AI and ML
 import torch
 import torch.nn as nn
@@ -81,6 +106,59 @@ ACTIVE_AGENTS = Gauge('swarm_active_agents_count', 'Number of active agents')
 SWARM_EFFICIENCY = Gauge('swarm_efficiency_ratio', 'Swarm efficiency ratio')
 CONSENSUS_TIME = Histogram('swarm_consensus_time_seconds', 'Time to reach consensus')
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def random_search(iterations: int, dimensions: int, quadratic: bool):
+        """Random search over [-10, 10]^d minimizing sum(x^2) or sum(|x|)"""
+        best_value = np.inf
+        best_solution = np.zeros(dimensions)
+        for _ in range(iterations):
+            solution = np.random.uniform(-10.0, 10.0, dimensions)
+            value = (solution * solution).sum() if quadratic else np.abs(solution).sum()
+            if value < best_value:
+                best_value = value
+                best_solution = solution
+        return best_solution, best_value
+else:
+    def random_search(iterations: int, dimensions: int, quadratic: bool):
+        """Random search over [-10, 10]^d minimizing sum(x^2) or sum(|x|)"""
+        solutions = np.random.uniform(-10.0, 10.0, (iterations, dimensions))
+        values = (solutions * solutions).sum(axis=1) if quadratic else np.abs(solutions).sum(axis=1)
+        best = int(values.argmin())
+        return solutions[best], values[best]
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def pso_step(positions, velocities, personal_best_positions, personal_best_scores,
+                 global_best_position, base_positions, w, c1, c2, optimal_distance):
+        """One in-place PSO iteration: move particles, score them, update personal bests"""
+        num_particles, dimensions = positions.shape
+        num_agents = base_positions.shape[0]
+        
+        for i in prange(num_particles):
+            r1 = np.random.random()
+            r2 = np.random.random()
+            for d in range(dimensions):
+                velocity = (w * velocities[i, d] +
+                            c1 * r1 * (personal_best_positions[i, d] - positions[i, d]) +
+                            c2 * r2 * (global_best_position[d] - positions[i, d]))
+                velocities[i, d] = velocity
+                positions[i, d] = min(max(positions[i, d] + velocity, 0.0), 100.0)
+            
+            total_distance = 0.0
+            for j in range(num_agents):
+                squared = 0.0
+                for d in range(dimensions):
+                    diff = positions[i, d] - base_positions[j, d]
+                    squared += diff * diff
+                total_distance += np.sqrt(squared)
+            
+            score = abs(total_distance / num_agents - optimal_distance)
+            if score < personal_best_scores[i]:
+                personal_best_scores[i] = score
+                for d in range(dimensions):
+                    personal_best_positions[i, d] = positions[i, d]
+
 class AgentRole(str, Enum):
     COORDINATOR = "coordinator"
     WORKER = "worker"
@@ -118,19 +196,23 @@ class SwarmTopology(str, Enum):
     SMALL_WORLD = "small_world"
     SCALE_FREE = "scale_free"
 
-@dataclass
+@dataclass(slots=True)
 class AgentCapabilities:
     """Agent capabilities and resources"""
     cpu_cores: int = 1
     memory_gb: float = 1.0
     gpu_available: bool = False
-    specialized_skills: List[str] = field(default_factory=list)
+    specialized_skills: FrozenSet[str] = frozenset()
     max_concurrent_tasks: int = 1
     reliability_score: float = 1.0
     processing_speed: float = 1.0
     communication_range: float = 100.0
+    
+    def __post_init__(self):
+        # Stored as a frozenset so capability checks are hashed lookups
+        self.specialized_skills = frozenset(self.specialized_skills)
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Task definition"""
     task_id: str
@@ -144,9 +226,9 @@ class Task:
     result: Optional[Any] = None
     status: str = "pending"
     assigned_agent: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: float = field(default_factory=time.time)  # epoch seconds
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     """Communication message"""
     message_id: str
@@ -154,10 +236,51 @@ class Message:
     receiver_id: Optional[str]  # None for broadcast
     message_type: MessageType
     content: Dict[str, Any]
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.time)  # epoch seconds
     ttl: int = 10  # Time to live (hops)
 
-@dataclass
+def _msgpack_default(obj: Any) -> Any:
+    """Encode values msgpack has no native type for"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def pack_message(message: Message) -> bytes:
+    """Serialize a message as a compact msgpack array"""
+    return msgpack.packb(
+        (message.message_id, message.sender_id, message.receiver_id,
+         message.message_type.value, message.content,
+         message.timestamp, message.ttl),
+        use_bin_type=True,
+        default=_msgpack_default
+    )
+
+def unpack_message(payload: bytes) -> Message:
+    """Rebuild a message serialized by pack_message"""
+    message_id, sender_id, receiver_id, message_type, content, timestamp, ttl = msgpack.unpackb(payload, raw=False)
+    return Message(
+        message_id=message_id,
+        sender_id=sender_id,
+        receiver_id=receiver_id,
+        message_type=MessageType(message_type),
+        content=content,
+        timestamp=timestamp,
+        ttl=ttl
+    )
+
+def unpack_capabilities(payload: Any) -> Dict[str, Any]:
+    """Decode a 'caps_pack' payload sent in response to request_caps"""
+    if isinstance(payload, bytes):
+        return msgpack.unpackb(payload, raw=False)
+    return payload
+
+@dataclass(slots=True)
 class SwarmMetrics:
     """Swarm performance metrics"""
     total_agents: int
@@ -170,6 +293,10 @@ class SwarmMetrics:
     consensus_time: float
     communication_overhead: float
 
+# Auctions with fewer bidders than this are scored with plain integer
+# bitmasks; NumPy setup costs more than it saves on tiny candidate lists
+AUCTION_VECTORIZE_MIN = 16
+
 class ConsensusAlgorithm(ABC):
     """Abstract base class for consensus algorithms"""
     
@@ -186,10 +313,11 @@ class RaftConsensus(ConsensusAlgorithm):
         self.log = []
         self.commit_index = 0
         self.last_applied = 0
+        self._rng = np.random.default_rng()
     
     async def reach_consensus(self, agents: List['Agent'], proposal: Dict[str, Any]) -> Dict[str, Any]:
         """Simplified Raft consensus"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Leader election (simplified)
         leader = self._elect_leader(agents)
@@ -206,7 +334,7 @@ class RaftConsensus(ConsensusAlgorithm):
             votes = await self._replicate_log_entry(agents, log_entry)
             
             if votes > len(agents) // 2:
-                consensus_time = time.time() - start_time
+                consensus_time = (time.perf_counter_ns() - start_time) * 1e-9
                 CONSENSUS_TIME.observe(consensus_time)
                 
                 return {
@@ -223,26 +351,25 @@ class RaftConsensus(ConsensusAlgorithm):
         """Elect leader (simplified)"""
         # In a real implementation, this would involve proper leader election
         active_agents = [agent for agent in agents if agent.is_active]
-        return random.choice(active_agents) if active_agents else None
+        return active_agents[self._rng.integers(len(active_agents))] if active_agents else None
     
     async def _replicate_log_entry(self, agents: List['Agent'], log_entry: Dict[str, Any]) -> int:
         """Replicate log entry to followers"""
-        votes = 1  # Leader votes for itself
+        followers = sum(1 for agent in agents if agent.is_active and agent.role != AgentRole.LEADER)
         
-        for agent in agents:
-            if agent.is_active and agent.role != AgentRole.LEADER:
-                # Simulate replication
-                if random.random() > 0.1:  # 90% success rate
-                    votes += 1
-        
-        return votes
+        # Simulate replication with a 90% success rate, one roll per follower
+        rolls = self._rng.random(followers)
+        return 1 + int((rolls > 0.1).sum())  # Leader votes for itself
 
 class PBFTConsensus(ConsensusAlgorithm):
     """Practical Byzantine Fault Tolerance consensus"""
     
+    def __init__(self):
+        self._rng = np.random.default_rng()
+    
     async def reach_consensus(self, agents: List['Agent'], proposal: Dict[str, Any]) -> Dict[str, Any]:
         """Simplified PBFT consensus"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         n = len([agent for agent in agents if agent.is_active])
         f = (n - 1) // 3  # Maximum Byzantine faults
@@ -260,7 +387,7 @@ class PBFTConsensus(ConsensusAlgorithm):
             if votes < required_votes:
                 return {'status': 'rejected', 'reason': f'Insufficient votes in {phase} phase'}
         
-        consensus_time = time.time() - start_time
+        consensus_time = (time.perf_counter_ns() - start_time) * 1e-9
         CONSENSUS_TIME.observe(consensus_time)
         
         return {
@@ -272,21 +399,21 @@ class PBFTConsensus(ConsensusAlgorithm):
     
     async def _collect_votes(self, agents: List['Agent'], proposal: Dict[str, Any], phase: str) -> int:
         """Collect votes for a phase"""
-        votes = 0
-        
-        for agent in agents:
-            if agent.is_active:
-                # Simulate voting (in reality, this would involve cryptographic verification)
-                if random.random() > 0.05:  # 95% honest agents
-                    votes += 1
+        active = sum(1 for agent in agents if agent.is_active)
         
-        return votes
+        # Simulate voting with 95% honest agents (in reality, this would
+        # involve cryptographic verification)
+        rolls = self._rng.random(active)
+        return int((rolls > 0.05).sum())
 
 class TaskScheduler:
     """Intelligent task scheduling for agent swarm"""
     
     def __init__(self):
-        self.pending_tasks = queue.PriorityQueue()
+        # Heap of (-priority, created_at, task_id, task); the unique task_id
+        # breaks ties so tasks themselves are never compared
+        self.pending_tasks: List[Tuple[int, float, str, Task]] = []
+        self._task_available = asyncio.Event()
         self.running_tasks = {}
         self.completed_tasks = {}
         self.failed_tasks = {}
@@ -294,16 +421,25 @@ class TaskScheduler:
     def add_task(self, task: Task):
         """Add task to scheduler"""
         priority = -task.priority  # Negative for max-heap behavior
-        self.pending_tasks.put((priority, task.created_at, task))
+        heapq.heappush(self.pending_tasks, (priority, task.created_at, task.task_id, task))
+        self._task_available.set()
         logger.info(f"Task {task.task_id} added to scheduler")
     
     def get_next_task(self) -> Optional[Task]:
         """Get next task for execution"""
-        try:
-            _, _, task = self.pending_tasks.get_nowait()
-            return task
-        except queue.Empty:
+        if not self.pending_tasks:
             return None
+        
+        task = heapq.heappop(self.pending_tasks)[-1]
+        if not self.pending_tasks:
+            self._task_available.clear()
+        return task
+    
+    async def wait_for_task(self) -> Task:
+        """Wait until a task is pending, then take the highest-priority one"""
+        while not self.pending_tasks:
+            await self._task_available.wait()
+        return self.get_next_task()
     
     def assign_task(self, task: Task, agent_id: str):
         """Assign task to agent"""
@@ -333,39 +469,196 @@ class TaskScheduler:
     def get_task_statistics(self) -> Dict[str, int]:
         """Get task statistics"""
         return {
-            'pending': self.pending_tasks.qsize(),
+            'pending': len(self.pending_tasks),
             'running': len(self.running_tasks),
             'completed': len(self.completed_tasks),
             'failed': len(self.failed_tasks)
         }
 
+# Queued to wake an agent's message loop when it stops
+_SHUTDOWN = object()
+
+class MessageQueue(asyncio.Queue):
+    """Bounded agent inbox that sheds stale idempotent messages under load"""
+    
+    # Newer heartbeats and coordination notices supersede older ones
+    SHEDDABLE = frozenset({MessageType.HEARTBEAT, MessageType.COORDINATION})
+    
+    # Messages live in a deque owned by this class, through the Queue's
+    # documented storage hooks, so shedding never touches asyncio internals
+    
+    def _init(self, maxsize):
+        self._messages = deque()
+    
+    def _put(self, item):
+        self._messages.append(item)
+    
+    def _get(self):
+        return self._messages.popleft()
+    
+    def qsize(self) -> int:
+        return len(self._messages)
+    
+    def empty(self) -> bool:
+        return not self._messages
+    
+    def put_nowait(self, item):
+        if self.full() and getattr(item, 'message_type', None) in self.SHEDDABLE:
+            if not self._shed_oldest():
+                return  # Only undroppable messages queued; drop the new one
+            # The new message takes the shed one's place: the queue stays
+            # full and its unfinished-task count is unchanged
+            self._messages.append(item)
+            return
+        super().put_nowait(item)
+    
+    async def put(self, item):
+        # Sheddable messages never wait for space; others apply back-pressure
+        if getattr(item, 'message_type', None) in self.SHEDDABLE:
+            self.put_nowait(item)
+        else:
+            await super().put(item)
+    
+    def _shed_oldest(self) -> bool:
+        """Remove the oldest sheddable message, if any"""
+        for queued in self._messages:
+            if getattr(queued, 'message_type', None) in self.SHEDDABLE:
+                self._messages.remove(queued)
+                return True
+        return False
+
+class PerformanceHistory:
+    """Fixed-size ring buffer of task outcomes, stored column-wise"""
+    
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.execution_times = np.zeros(capacity, dtype=np.float32)
+        self.successes = np.zeros(capacity, dtype=bool)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.last_failure: Optional[Dict[str, Any]] = None
+        self._index = 0
+        self._size = 0
+        
+        # Window totals kept in step with the buffers so means are O(1)
+        self._time_sum = 0.0
+        self._success_count = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def record(self, execution_time: float, success: bool, timestamp: float):
+        """Store one task outcome, overwriting the oldest once full"""
+        i = self._index
+        if self._size == self.capacity:
+            self._time_sum -= float(self.execution_times[i])
+            self._success_count -= int(self.successes[i])
+        
+        self.execution_times[i] = execution_time
+        self.successes[i] = success
+        self.timestamps[i] = timestamp
+        
+        # Add the stored (float32) value so the subtraction above cancels exactly
+        self._time_sum += float(self.execution_times[i])
+        self._success_count += bool(success)
+        self._index = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+    
+    def mean_execution_time(self) -> float:
+        """Average execution time over the recorded window"""
+        return self._time_sum / self._size if self._size else 0.0
+    
+    def success_ratio(self) -> float:
+        """Fraction of successful tasks over the recorded window"""
+        return self._success_count / self._size if self._size else 1.0
+
 class Agent:
     """Autonomous agent in the swarm"""
     
-    def __init__(self, agent_id: str, role: AgentRole, capabilities: AgentCapabilities):
+    def __init__(self, agent_id: str, role: AgentRole, capabilities: AgentCapabilities,
+                 zmq_endpoint: Optional[str] = None):
         self.agent_id = agent_id
         self.role = role
+        self.current_tasks = {}
         self.capabilities = capabilities
         self.is_active = True
-        self.current_tasks = {}
-        self.message_queue = asyncio.Queue()
+        self.message_queue = MessageQueue(maxsize=1024)
         self.neighbors = set()
         self.position = (random.uniform(0, 100), random.uniform(0, 100))  # 2D position
-        self.last_heartbeat = datetime.now()
-        self.performance_history = deque(maxlen=100)
         
-        # Communication
+        # Wall-clock anchor; later timestamps are derived from the monotonic
+        # clock and the anchor is re-read once a minute to follow clock changes
+        self._base_wall = datetime.now()
+        self._base_mono = time.monotonic()
+        self.last_heartbeat = self._base_wall
+        self.performance_history = PerformanceHistory(100)
+        
+        # Heartbeat sequence numbers, sent and last seen per sender
+        self._heartbeat_sequence = 0
+        self._last_heartbeat_seq: Dict[str, int] = {}
+        
+        # Message ids are agent_id-sequence; agent ids are unique in the swarm
+        self._message_prefix = f"{agent_id}-"
+        self._message_sequence = itertools.count()
+        
+        # Communication; with a ZeroMQ endpoint, messages travel as msgpack
+        # frames through a broker instead of the in-process queue
         self.websocket = None
+        self.zmq_endpoint = zmq_endpoint
         self.zmq_socket = None
+        self.broker: Optional['MessageBroker'] = None  # set when joining a swarm
         
         # Learning and adaptation
         self.experience_buffer = deque(maxlen=1000)
         self.success_rate = 1.0
         
+        # Message handlers, bound once so dispatch is a single dict lookup
+        self._message_handlers = {
+            MessageType.TASK_REQUEST: self._handle_task_request,
+            MessageType.HEARTBEAT: self._handle_heartbeat,
+            MessageType.COORDINATION: self._handle_coordination,
+            MessageType.CONSENSUS: self._handle_consensus,
+        }
+        
+    @property
+    def capabilities(self) -> AgentCapabilities:
+        """Agent capabilities and resources"""
+        return self._capabilities
+    
+    @capabilities.setter
+    def capabilities(self, capabilities: AgentCapabilities):
+        # Responses carry capabilities only on request, as one payload built
+        # when the capabilities are replaced rather than once per message
+        self._capabilities = capabilities
+        caps_dict = asdict(capabilities)
+        if MSGPACK_AVAILABLE:
+            self._caps_payload = msgpack.packb(caps_dict, use_bin_type=True, default=_msgpack_default)
+        else:
+            self._caps_payload = caps_dict
+        
+        # Load checks run on every task, resource and consensus message
+        self._max_conc = capabilities.max_concurrent_tasks
+        self._half_conc = capabilities.max_concurrent_tasks // 2
+        self._skills = capabilities.specialized_skills
+        self._refresh_vote_flags()
+    
     async def start(self):
         """Start agent operations"""
         logger.info(f"Agent {self.agent_id} starting with role {self.role}")
         
+        if NUMBA_AVAILABLE:
+            # Compile the search kernel now rather than inside the first task
+            random_search(1, 1, True)
+        
+        if self.zmq_endpoint:
+            if MSGPACK_AVAILABLE:
+                self.zmq_socket = zmq.asyncio.Context.instance().socket(zmq.DEALER)
+                self.zmq_socket.setsockopt(zmq.IDENTITY, self.agent_id.encode())
+                self.zmq_socket.setsockopt(zmq.SNDHWM, 10000)
+                self.zmq_socket.connect(self.zmq_endpoint)
+                asyncio.create_task(self._zmq_receive_loop())
+            else:
+                logger.warning(f"msgpack not installed; agent {self.agent_id} keeps the in-process message queue")
+        
         # Start background tasks
         asyncio.create_task(self._heartbeat_loop())
         asyncio.create_task(self._message_processing_loop())
@@ -377,14 +670,43 @@ class Agent:
         """Stop agent operations"""
         logger.info(f"Agent {self.agent_id} stopping")
         self.is_active = False
+        try:
+            self.message_queue.put_nowait(_SHUTDOWN)
+        except asyncio.QueueFull:
+            # The backlog is moot once stopped; make room for the sentinel
+            self.message_queue.get_nowait()
+            self.message_queue.put_nowait(_SHUTDOWN)
         
         if self.websocket:
             await self.websocket.close()
+        
+        if self.zmq_socket is not None:
+            self.zmq_socket.close(linger=0)
+            self.zmq_socket = None
+    
+    def _next_message_id(self) -> str:
+        """Return a swarm-unique id for a message sent by this agent"""
+        return f"{self._message_prefix}{next(self._message_sequence)}"
+    
+    def _wall_clock(self, offset: float = 0.0) -> datetime:
+        """Return the current wall-clock time plus offset seconds"""
+        elapsed = time.monotonic() - self._base_mono
+        if elapsed > 60.0:
+            self._base_wall = datetime.now()
+            self._base_mono = time.monotonic()
+            elapsed = 0.0
+        return self._base_wall + timedelta(seconds=elapsed + offset)
     
     async def send_message(self, message: Message):
         """Send message to other agents"""
         SWARM_COMMUNICATION_MESSAGES.labels(message_type=message.message_type.value).inc()
         
+        if self.zmq_socket is not None:
+            # Frames: receiver id (empty for broadcast), then the payload
+            receiver = message.receiver_id.encode() if message.receiver_id else b''
+            await self.zmq_socket.send_multipart([receiver, pack_message(message)])
+            return
+        
         # Add to message queue for processing
         await self.message_queue.put(message)
     
@@ -392,41 +714,32 @@ class Agent:
         """Receive and process message"""
         logger.debug(f"Agent {self.agent_id} received message {message.message_type} from {message.sender_id}")
         
-        if message.message_type == MessageType.TASK_REQUEST:
-            await self._handle_task_request(message)
-        elif message.message_type == MessageType.HEARTBEAT:
-            await self._handle_heartbeat(message)
-        elif message.message_type == MessageType.COORDINATION:
-            await self._handle_coordination(message)
-        elif message.message_type == MessageType.CONSENSUS:
-            await self._handle_consensus(message)
+        handler = self._message_handlers.get(message.message_type)
+        if handler:
+            await handler(message)
     
     async def execute_task(self, task: Task) -> Any:
         """Execute a task"""
         logger.info(f"Agent {self.agent_id} executing task {task.task_id}")
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             # Check if agent has required capabilities
             if not self._can_execute_task(task):
                 raise ValueError(f"Agent lacks required capabilities: {task.required_capabilities}")
             
+            self.current_tasks[task.task_id] = task
+            self._refresh_vote_flags()
+            
             # Simulate task execution based on type
             result = await self._execute_task_by_type(task)
             
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_time) * 1e-9
             
-            # Update performance metrics
-            self.performance_history.append({
-                'task_id': task.task_id,
-                'execution_time': execution_time,
-                'success': True,
-                'timestamp': datetime.now()
-            })
-            
-            # Update success rate
-            self._update_success_rate(True)
+            # Update performance metrics and success rate
+            self.performance_history.record(execution_time, True, time.time())
+            self._update_success_rate()
             
             AGENT_TASKS_COMPLETED.labels(agent_id=self.agent_id).inc()
             TASK_EXECUTION_TIME.observe(execution_time)
@@ -436,32 +749,34 @@ class Agent:
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = (time.perf_counter_ns() - start_time) * 1e-9
             
-            # Update performance metrics
-            self.performance_history.append({
+            # Update performance metrics and success rate; only the latest
+            # failure keeps its details
+            timestamp = time.time()
+            self.performance_history.record(execution_time, False, timestamp)
+            self.performance_history.last_failure = {
                 'task_id': task.task_id,
-                'execution_time': execution_time,
-                'success': False,
                 'error': str(e),
-                'timestamp': datetime.now()
-            })
-            
-            # Update success rate
-            self._update_success_rate(False)
+                'timestamp': timestamp
+            }
+            self._update_success_rate()
             
             logger.error(f"Agent {self.agent_id} failed to execute task {task.task_id}: {e}")
             raise
+        
+        finally:
+            if self.current_tasks.pop(task.task_id, None) is not None:
+                self._refresh_vote_flags()
     
     def _can_execute_task(self, task: Task) -> bool:
         """Check if agent can execute task"""
         # Check capabilities
-        for required_capability in task.required_capabilities:
-            if required_capability not in self.capabilities.specialized_skills:
-                return False
+        if not self._skills.issuperset(task.required_capabilities):
+            return False
         
         # Check current load
-        if len(self.current_tasks) >= self.capabilities.max_concurrent_tasks:
+        if len(self.current_tasks) >= self._max_conc:
             return False
         
         return True
@@ -488,15 +803,27 @@ class Agent:
         # Simulate computational work
         data = task.data.get('input', [])
         
-        if isinstance(data, list) and all(isinstance(x, (int, float)) for x in data):
+        # One conversion replaces the per-element type check; anything that
+        # is not a flat numeric list falls through to the generic branch
+        try:
+            values = np.asarray(data) if isinstance(data, list) else None
+        except ValueError:  # ragged nesting
+            values = None
+        
+        if values is not None and values.ndim == 1 and values.dtype.kind in 'iuf':
             # Mathematical computation
-            result = {
-                'sum': sum(data),
-                'mean': np.mean(data) if data else 0,
-                'std': np.std(data) if len(data) > 1 else 0,
-                'min': min(data) if data else 0,
-                'max': max(data) if data else 0
-            }
+            values = values.astype(np.float64, copy=False)
+            if values.size:
+                total = values.sum()
+                result = {
+                    'sum': float(total),
+                    'mean': float(total / values.size),
+                    'std': float(values.std()) if values.size > 1 else 0.0,
+                    'min': float(values.min()),
+                    'max': float(values.max())
+                }
+            else:
+                result = {'sum': 0.0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
         else:
             # Generic computation
             await asyncio.sleep(task.estimated_duration)
@@ -512,13 +839,11 @@ class Agent:
         await asyncio.sleep(min(task.estimated_duration, len(data) * 0.001))
         
         processed_data = []
-        for item in data[:1000]:  # Limit processing
-            if isinstance(item, dict):
-                # Process dictionary data
-                processed_item = {k: v for k, v in item.items() if v is not None}
-                processed_data.append(processed_item)
-            else:
-                processed_data.append(item)
+        for item in itertools.islice(data, 1000):  # Limit processing
+            # Process dictionary data; already-clean dicts are kept as they are
+            if isinstance(item, dict) and any(v is None for v in item.values()):
+                item = {k: v for k, v in item.items() if v is not None}
+            processed_data.append(item)
         
         return {
             'processed_count': len(processed_data),
@@ -532,25 +857,14 @@ class Agent:
         objective_function = task.data.get('objective_function', 'minimize_quadratic')
         dimensions = task.data.get('dimensions', 2)
         
-        # Simple optimization using random search
-        best_solution = None
-        best_value = float('inf')
-        
-        for _ in range(100):  # Limited iterations
-            solution = np.random.uniform(-10, 10, dimensions)
-            
-            if objective_function == 'minimize_quadratic':
-                value = np.sum(solution ** 2)
-            else:
-                value = np.sum(np.abs(solution))
-            
-            if value < best_value:
-                best_value = value
-                best_solution = solution.tolist()
+        # Simple optimization using random search (limited iterations)
+        best_solution, best_value = random_search(
+            100, int(dimensions), objective_function == 'minimize_quadratic'
+        )
         
         return {
-            'best_solution': best_solution,
-            'best_value': best_value,
+            'best_solution': best_solution.tolist(),
+            'best_value': float(best_value),
             'iterations': 100
         }
     
@@ -562,30 +876,31 @@ class Agent:
         # Simulate search
         await asyncio.sleep(min(task.estimated_duration, 0.1))
         
-        # Binary search simulation
-        left, right = 0, len(search_space) - 1
-        steps = 0
+        values = np.asarray(search_space)
+        size = values.size
         
-        while left <= right:
-            mid = (left + right) // 2
-            steps += 1
-            
-            if search_space[mid] == target:
-                return {
-                    'found': True,
-                    'position': mid,
-                    'steps': steps,
-                    'value': search_space[mid]
-                }
-            elif search_space[mid] < target:
-                left = mid + 1
-            else:
-                right = mid - 1
+        if size and np.all(values[:-1] <= values[1:]):
+            # Sorted input: a single binary search in C
+            position = int(np.searchsorted(values, target))
+            steps = int(math.log2(size)) + 1
+        else:
+            # Unsorted (or empty) input: linear scan
+            matches = np.flatnonzero(values == target)
+            position = int(matches[0]) if matches.size else size
+            steps = size
+        
+        if position < size and values[position] == target:
+            return {
+                'found': True,
+                'position': position,
+                'steps': steps,
+                'value': search_space[position]
+            }
         
         return {
             'found': False,
             'steps': steps,
-            'closest_position': left if left < len(search_space) else right
+            'closest_position': min(position, size - 1)
         }
     
     async def _execute_classification_task(self, task: Task) -> Any:
@@ -600,16 +915,20 @@ class Agent:
         
         # Simple classification based on feature values
         if isinstance(data[0], (list, np.ndarray)):
-            # Multiple samples
-            predictions = []
-            for sample in data:
-                # Simple rule-based classification
-                prediction = 1 if np.mean(sample) > 0 else 0
-                confidence = min(abs(np.mean(sample)) + 0.5, 1.0)
-                predictions.append({
-                    'class': prediction,
-                    'confidence': confidence
-                })
+            # Multiple samples, classified together from their row means
+            try:
+                # Flatten each sample so multi-dimensional samples still give one mean
+                means = np.asarray(data, dtype=np.float64).reshape(len(data), -1).mean(axis=1)
+            except ValueError:  # samples of differing lengths
+                means = np.fromiter((np.mean(sample) for sample in data), np.float64, len(data))
+            
+            # Simple rule-based classification
+            classes = (means > 0).astype(np.int8)
+            confidences = np.minimum(np.abs(means) + 0.5, 1.0)
+            predictions = [
+                {'class': int(prediction), 'confidence': float(confidence)}
+                for prediction, confidence in zip(classes, confidences)
+            ]
             
             return {
                 'predictions': predictions,
@@ -618,8 +937,9 @@ class Agent:
             }
         else:
             # Single sample
-            prediction = 1 if np.mean(data) > 0 else 0
-            confidence = min(abs(np.mean(data)) + 0.5, 1.0)
+            mean = float(np.mean(data))
+            prediction = 1 if mean > 0 else 0
+            confidence = min(abs(mean) + 0.5, 1.0)
             
             return {
                 'class': prediction,
@@ -633,21 +953,24 @@ class Agent:
         
         if task_data and self._can_execute_task_from_data(task_data):
             # Accept task
+            content = {
+                'status': 'accepted',
+                'estimated_completion': self._wall_clock(task_data.get('estimated_duration', 1))
+            }
+            if message.content.get('request_caps'):
+                content['caps_pack'] = self._caps_payload
+            
             response = Message(
-                message_id=str(uuid.uuid4()),
+                message_id=self._next_message_id(),
                 sender_id=self.agent_id,
                 receiver_id=message.sender_id,
                 message_type=MessageType.TASK_RESPONSE,
-                content={
-                    'status': 'accepted',
-                    'agent_capabilities': self.capabilities.__dict__,
-                    'estimated_completion': datetime.now() + timedelta(seconds=task_data.get('estimated_duration', 1))
-                }
+                content=content
             )
         else:
             # Reject task
             response = Message(
-                message_id=str(uuid.uuid4()),
+                message_id=self._next_message_id(),
                 sender_id=self.agent_id,
                 receiver_id=message.sender_id,
                 message_type=MessageType.TASK_RESPONSE,
@@ -660,31 +983,40 @@ class Agent:
         """Check if agent can execute task from data"""
         required_capabilities = task_data.get('required_capabilities', [])
         
-        for capability in required_capabilities:
-            if capability not in self.capabilities.specialized_skills:
-                return False
+        if not self._skills.issuperset(required_capabilities):
+            return False
         
-        return len(self.current_tasks) < self.capabilities.max_concurrent_tasks
+        return len(self.current_tasks) < self._max_conc
     
     async def _handle_heartbeat(self, message: Message):
         """Handle heartbeat message"""
         sender_id = message.sender_id
         
+        # Heartbeats are snapshots; skip any older than one already handled
+        seq = message.content.get('seq')
+        if seq is not None:
+            if seq <= self._last_heartbeat_seq.get(sender_id, -1):
+                return
+            self._last_heartbeat_seq[sender_id] = seq
+        
         # Update neighbor information
         if sender_id not in self.neighbors:
             self.neighbors.add(sender_id)
         
         # Send heartbeat response
+        content = {
+            'status': 'alive',
+            'load': len(self.current_tasks)
+        }
+        if message.content.get('request_caps'):
+            content['caps_pack'] = self._caps_payload
+        
         response = Message(
-            message_id=str(uuid.uuid4()),
+            message_id=self._next_message_id(),
             sender_id=self.agent_id,
             receiver_id=sender_id,
             message_type=MessageType.HEARTBEAT,
-            content={
-                'status': 'alive',
-                'load': len(self.current_tasks),
-                'capabilities': self.capabilities.__dict__
-            }
+            content=content
         )
         
         await self.send_message(response)
@@ -699,26 +1031,30 @@ class Agent:
             await self._handle_load_balancing(message)
         elif coordination_type == 'topology_update':
             await self._handle_topology_update(message)
+        elif coordination_type == 'topology_delta':
+            await self._handle_topology_delta(message)
     
     async def _handle_resource_request(self, message: Message):
         """Handle resource request"""
         requested_resources = message.content.get('resources', {})
         
-        # Check if agent can provide resources
-        can_provide = True
+        # Check if agent can provide resources; this dict is also the
+        # response payload, so it is the only one built per request
+        load = len(self.current_tasks)
+        capabilities = self.capabilities
         available_resources = {
-            'cpu': max(0, self.capabilities.cpu_cores - len(self.current_tasks)),
-            'memory': max(0, self.capabilities.memory_gb - len(self.current_tasks) * 0.1),
-            'gpu': self.capabilities.gpu_available and len(self.current_tasks) == 0
+            'cpu': max(0, capabilities.cpu_cores - load),
+            'memory': max(0, capabilities.memory_gb - load * 0.1),
+            'gpu': capabilities.gpu_available and load == 0
         }
         
-        for resource, amount in requested_resources.items():
-            if available_resources.get(resource, 0) < amount:
-                can_provide = False
-                break
+        can_provide = not any(
+            available_resources.get(resource, 0) < amount
+            for resource, amount in requested_resources.items()
+        )
         
         response = Message(
-            message_id=str(uuid.uuid4()),
+            message_id=self._next_message_id(),
             sender_id=self.agent_id,
             receiver_id=message.sender_id,
             message_type=MessageType.COORDINATION,
@@ -733,17 +1069,17 @@ class Agent:
     
     async def _handle_load_balancing(self, message: Message):
         """Handle load balancing request"""
-        if len(self.current_tasks) > self.capabilities.max_concurrent_tasks // 2:
+        if len(self.current_tasks) > self._half_conc:
             # Agent is overloaded, request task redistribution
             response = Message(
-                message_id=str(uuid.uuid4()),
+                message_id=self._next_message_id(),
                 sender_id=self.agent_id,
                 receiver_id=None,  # Broadcast
                 message_type=MessageType.COORDINATION,
                 content={
                     'type': 'redistribute_tasks',
                     'current_load': len(self.current_tasks),
-                    'max_capacity': self.capabilities.max_concurrent_tasks
+                    'max_capacity': self._max_conc
                 }
             )
             
@@ -756,6 +1092,11 @@ class Agent:
         
         logger.info(f"Agent {self.agent_id} updated topology: {len(self.neighbors)} neighbors")
     
+    async def _handle_topology_delta(self, message: Message):
+        """Apply incremental neighbor changes"""
+        self.neighbors.update(message.content.get('added', ()))
+        self.neighbors.difference_update(message.content.get('removed', ()))
+    
     async def _handle_consensus(self, message: Message):
         """Handle consensus message"""
         proposal = message.content.get('proposal')
@@ -765,7 +1106,7 @@ class Agent:
         vote = self._evaluate_proposal(proposal)
         
         response = Message(
-            message_id=str(uuid.uuid4()),
+            message_id=self._next_message_id(),
             sender_id=self.agent_id,
             receiver_id=message.sender_id,
             message_type=MessageType.CONSENSUS,
@@ -778,50 +1119,56 @@ class Agent:
         
         await self.send_message(response)
     
-    def _evaluate_proposal(self, proposal: Dict[str, Any]) -> bool:
-        """Evaluate a consensus proposal"""
-        # Simple evaluation based on agent's current state and capabilities
-        proposal_type = proposal.get('type')
-        
-        if proposal_type == 'task_allocation':
+    def _refresh_vote_flags(self):
+        """Recompute consensus votes after the agent's load or limits change"""
+        load = len(self.current_tasks)
+        self._vote_flags = {
             # Vote based on current load
-            return len(self.current_tasks) < self.capabilities.max_concurrent_tasks
-        elif proposal_type == 'topology_change':
+            'task_allocation': load < self._max_conc,
             # Generally accept topology changes
-            return True
-        elif proposal_type == 'resource_allocation':
+            'topology_change': True,
             # Vote based on resource availability
-            return len(self.current_tasks) < self.capabilities.max_concurrent_tasks // 2
-        
-        # Default: accept proposal
-        return True
+            'resource_allocation': load < self._half_conc,
+        }
+    
+    def _evaluate_proposal(self, proposal: Dict[str, Any]) -> bool:
+        """Evaluate a consensus proposal"""
+        # Votes only depend on load, which changes on task start/finish,
+        # so a round of proposals reads precomputed answers. Default: accept
+        return self._vote_flags.get(proposal.get('type'), True)
     
-    def _update_success_rate(self, success: bool):
-        """Update agent's success rate"""
-        alpha = 0.1  # Learning rate
-        self.success_rate = alpha * (1.0 if success else 0.0) + (1 - alpha) * self.success_rate
+    def _update_success_rate(self):
+        """Update agent's success rate from its recent task outcomes"""
+        self.success_rate = self.performance_history.success_ratio()
     
     async def _heartbeat_loop(self):
         """Send periodic heartbeats"""
         while self.is_active:
             try:
-                self.last_heartbeat = datetime.now()
+                self.last_heartbeat = self._wall_clock()
+                self._heartbeat_sequence += 1
                 
                 # Broadcast heartbeat to neighbors
                 heartbeat_message = Message(
-                    message_id=str(uuid.uuid4()),
+                    message_id=self._next_message_id(),
                     sender_id=self.agent_id,
                     receiver_id=None,  # Broadcast
                     message_type=MessageType.HEARTBEAT,
                     content={
                         'timestamp': self.last_heartbeat.isoformat(),
+                        'seq': self._heartbeat_sequence,
                         'status': 'active',
                         'load': len(self.current_tasks),
                         'position': self.position
                     }
                 )
                 
-                await self.send_message(heartbeat_message)
+                if self.broker is not None and self.zmq_socket is None:
+                    # One message, fanned out by reference to every subscriber
+                    SWARM_COMMUNICATION_MESSAGES.labels(message_type=MessageType.HEARTBEAT.value).inc()
+                    self.broker.publish("heartbeat", heartbeat_message)
+                else:
+                    await self.send_message(heartbeat_message)
                 await asyncio.sleep(5)  # Heartbeat every 5 seconds
                 
             except Exception as e:
@@ -830,21 +1177,33 @@ class Agent:
     
     async def _message_processing_loop(self):
         """Process incoming messages"""
-        while self.is_active:
+        while True:
+            message = await self.message_queue.get()
+            if message is _SHUTDOWN:
+                break
+            
             try:
-                message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
                 await self.receive_message(message)
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 logger.error(f"Message processing error for agent {self.agent_id}: {e}")
     
+    async def _zmq_receive_loop(self):
+        """Process messages delivered over ZeroMQ"""
+        while self.is_active and self.zmq_socket is not None:
+            try:
+                frames = await self.zmq_socket.recv_multipart()
+                await self.receive_message(unpack_message(frames[-1]))
+            except zmq.ZMQError:
+                break
+            except Exception as e:
+                logger.error(f"ZeroMQ message error for agent {self.agent_id}: {e}")
+    
     async def _task_execution_loop(self):
         """Execute assigned tasks"""
         while self.is_active:
             try:
                 # Check for new tasks to execute
-                if len(self.current_tasks) < self.capabilities.max_concurrent_tasks:
+                if len(self.current_tasks) < self._max_conc:
                     # In a real implementation, this would get tasks from the swarm coordinator
                     pass
                 
@@ -856,12 +1215,30 @@ class Agent:
 class SwarmCoordinator:
     """Central coordinator for the agent swarm"""
     
+    # Agent/task changes that make a new optimization pass worthwhile
+    OPTIMIZE_CHANGE_THRESHOLD = 10
+    
     def __init__(self, consensus_algorithm: ConsensusAlgorithm = None):
         self.agents = {}
         self.task_scheduler = TaskScheduler()
         self.consensus_algorithm = consensus_algorithm or RaftConsensus()
         self.topology = SwarmTopology.FULLY_CONNECTED
-        self.network_graph = nx.Graph()
+        
+        # Ids for coordinator-sent messages, numbered like agent messages
+        self._message_sequence = itertools.count()
+        
+        # Inverted index: capability -> ids of agents that have it
+        self._capability_index: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Per-agent bidding attributes stored column-wise for vectorized
+        # auctions; rows are reused by swap-removal when agents leave
+        self._capability_ids: Dict[str, int] = {}
+        self._agent_rows: Dict[str, int] = {}
+        self._row_agent_ids: List[str] = []
+        self._skill_masks: Dict[str, int] = {}
+        self._skill_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._reliability = np.zeros(0, dtype=np.float64)
+        self._max_concurrent = np.zeros(0, dtype=np.float64)
         
         # Communication infrastructure
         self.message_broker = MessageBroker()
@@ -871,14 +1248,36 @@ class SwarmCoordinator:
         
         # Swarm intelligence algorithms
         self.swarm_optimizer = SwarmOptimizer()
+        
+        # Set once enough changes accumulated since the last optimization
+        self.optimize_event = asyncio.Event()
+        self._changes_since_optimize = 0
+    
+    def _record_change(self):
+        """Count a swarm change and request optimization past the threshold"""
+        self._changes_since_optimize += 1
+        if self._changes_since_optimize >= self.OPTIMIZE_CHANGE_THRESHOLD:
+            self.optimize_event.set()
     
     async def add_agent(self, agent: Agent):
         """Add agent to swarm"""
         self.agents[agent.agent_id] = agent
-        self.network_graph.add_node(agent.agent_id, agent=agent)
+        self._record_change()
+        
+        for skill in agent.capabilities.specialized_skills:
+            self._capability_index[skill].add(agent.agent_id)
+        self._add_agent_row(agent)
+        
+        # Broker deliveries land directly in the agent's own queue
+        self.message_broker.message_queues[agent.agent_id] = agent.message_queue
+        await self.message_broker.subscribe(agent.agent_id, "heartbeat")
+        agent.broker = self.message_broker
         
-        # Update topology
-        await self._update_topology()
+        # Update topology; a fully connected swarm only needs the new edges
+        if self.topology == SwarmTopology.FULLY_CONNECTED:
+            await self._add_edges_for(agent)
+        else:
+            await self._update_topology()
         
         # Start agent
         await agent.start()
@@ -894,10 +1293,21 @@ class SwarmCoordinator:
             await agent.stop()
             
             del self.agents[agent_id]
-            self.network_graph.remove_node(agent_id)
+            self._record_change()
+            
+            for skill in agent.capabilities.specialized_skills:
+                self._capability_index[skill].discard(agent_id)
+            self._remove_agent_row(agent_id)
+            
+            await self.message_broker.unsubscribe(agent_id, "heartbeat")
+            self.message_broker.message_queues.pop(agent_id, None)
+            agent.broker = None
             
             # Update topology
-            await self._update_topology()
+            if self.topology == SwarmTopology.FULLY_CONNECTED:
+                await self._remove_edges_for(agent_id)
+            else:
+                await self._update_topology()
             
             ACTIVE_AGENTS.set(len([a for a in self.agents.values() if a.is_active]))
             
@@ -906,6 +1316,7 @@ class SwarmCoordinator:
     async def submit_task(self, task: Task):
         """Submit task to swarm"""
         logger.info(f"Submitting task {task.task_id} to swarm")
+        self._record_change()
         
         # Add to scheduler
         self.task_scheduler.add_task(task)
@@ -938,35 +1349,105 @@ class SwarmCoordinator:
     
     def _find_suitable_agents(self, task: Task) -> List[Agent]:
         """Find agents suitable for executing a task"""
-        suitable_agents = []
-        
-        for agent in self.agents.values():
-            if agent.is_active and agent._can_execute_task(task):
-                suitable_agents.append(agent)
+        required = task.required_capabilities
+        candidates: Iterable[Agent] = self.agents.values()
+        
+        if required:
+            # Intersect the index sets, smallest first
+            indexed = sorted((self._capability_index.get(skill, set()) for skill in required), key=len)
+            candidate_ids = indexed[0].intersection(*indexed[1:])
+            candidates = [self.agents[agent_id] for agent_id in candidate_ids]
+        
+        return [
+            agent for agent in candidates
+            if agent.is_active and len(agent.current_tasks) < agent.capabilities.max_concurrent_tasks
+        ]
+    
+    def _add_agent_row(self, agent: Agent):
+        """Append an agent's bidding attributes to the column arrays"""
+        self._remove_agent_row(agent.agent_id)  # re-adding replaces the old row
+        
+        for skill in agent.capabilities.specialized_skills:
+            self._capability_ids.setdefault(skill, len(self._capability_ids))
+        
+        rows, columns = self._skill_matrix.shape
+        skill_matrix = np.zeros((rows + 1, len(self._capability_ids)), dtype=np.float32)
+        skill_matrix[:rows, :columns] = self._skill_matrix
+        skill_matrix[rows, [self._capability_ids[s] for s in agent.capabilities.specialized_skills]] = 1.0
+        
+        self._skill_matrix = skill_matrix
+        self._reliability = np.append(self._reliability, agent.capabilities.reliability_score)
+        self._max_concurrent = np.append(self._max_concurrent, agent.capabilities.max_concurrent_tasks)
+        self._agent_rows[agent.agent_id] = rows
+        self._row_agent_ids.append(agent.agent_id)
+        self._skill_masks[agent.agent_id] = self._skill_mask(agent.capabilities.specialized_skills)
+    
+    def _remove_agent_row(self, agent_id: str):
+        """Drop an agent's row by moving the last row into its place"""
+        self._skill_masks.pop(agent_id, None)
+        row = self._agent_rows.pop(agent_id, None)
+        if row is None:
+            return
         
-        return suitable_agents
+        last = len(self._row_agent_ids) - 1
+        if row != last:
+            moved_id = self._row_agent_ids[last]
+            self._skill_matrix[row] = self._skill_matrix[last]
+            self._reliability[row] = self._reliability[last]
+            self._max_concurrent[row] = self._max_concurrent[last]
+            self._row_agent_ids[row] = moved_id
+            self._agent_rows[moved_id] = row
+        
+        self._row_agent_ids.pop()
+        self._skill_matrix = self._skill_matrix[:last]
+        self._reliability = self._reliability[:last]
+        self._max_concurrent = self._max_concurrent[:last]
+    
+    def _skill_mask(self, skills: Iterable[str]) -> int:
+        """Encode known skills as a bitmask over the capability vocabulary"""
+        mask = 0
+        for skill in skills:
+            skill_id = self._capability_ids.get(skill)
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
     
     async def _auction_task(self, task: Task, suitable_agents: List[Agent]) -> Optional[Agent]:
         """Auction task to agents and select the best bid"""
-        bids = []
-        
-        for agent in suitable_agents:
-            # Calculate bid based on agent's current load and capabilities
-            load_factor = len(agent.current_tasks) / agent.capabilities.max_concurrent_tasks
-            capability_score = len(set(task.required_capabilities) & set(agent.capabilities.specialized_skills))
-            reliability_score = agent.capabilities.reliability_score
-            
-            # Bid is inversely related to load and directly related to capability and reliability
-            bid_score = (capability_score + reliability_score) / (1 + load_factor)
-            
-            bids.append((bid_score, agent))
-        
-        if bids:
-            # Select agent with highest bid
-            bids.sort(key=lambda x: x[0], reverse=True)
-            return bids[0][1]
+        if not suitable_agents:
+            return None
         
-        return None
+        count = len(suitable_agents)
+        
+        if count < AUCTION_VECTORIZE_MIN:
+            # Capability score is the popcount of the shared skill bits
+            required_mask = self._skill_mask(task.required_capabilities)
+            best_agent, best_bid = None, -math.inf
+            for agent in suitable_agents:
+                load_factor = len(agent.current_tasks) / agent.capabilities.max_concurrent_tasks
+                capability_score = (self._skill_masks[agent.agent_id] & required_mask).bit_count()
+                bid = (capability_score + agent.capabilities.reliability_score) / (1 + load_factor)
+                if bid > best_bid:
+                    best_agent, best_bid = agent, bid
+            return best_agent
+        
+        rows = np.fromiter((self._agent_rows[agent.agent_id] for agent in suitable_agents), np.intp, count)
+        loads = np.fromiter((len(agent.current_tasks) for agent in suitable_agents), np.float64, count)
+        
+        # Capability score: how many of the (distinct) required skills each agent has
+        required = [
+            self._capability_ids[skill]
+            for skill in dict.fromkeys(task.required_capabilities)
+            if skill in self._capability_ids
+        ]
+        capability_scores = self._skill_matrix[np.ix_(rows, required)].sum(axis=1) if required else 0.0
+        
+        # Bid is inversely related to load and directly related to capability and reliability
+        load_factors = loads / self._max_concurrent[rows]
+        bids = (capability_scores + self._reliability[rows]) / (1 + load_factors)
+        
+        # Select agent with highest bid (first one on ties)
+        return suitable_agents[int(np.argmax(bids))]
     
     async def _update_topology(self):
         """Update swarm topology"""
@@ -978,7 +1459,6 @@ class SwarmCoordinator:
                 for j, agent2 in enumerate(agents):
                     if i != j:
                         agent1.neighbors.add(agent2.agent_id)
-                        self.network_graph.add_edge(agent1.agent_id, agent2.agent_id)
         
         elif self.topology == SwarmTopology.RING:
             # Connect agents in a ring
@@ -990,9 +1470,6 @@ class SwarmCoordinator:
                     
                     agent.neighbors.add(next_agent.agent_id)
                     agent.neighbors.add(prev_agent.agent_id)
-                    
-                    self.network_graph.add_edge(agent.agent_id, next_agent.agent_id)
-                    self.network_graph.add_edge(agent.agent_id, prev_agent.agent_id)
         
         elif self.topology == SwarmTopology.STAR:
             # Connect all agents to a central coordinator
@@ -1004,8 +1481,6 @@ class SwarmCoordinator:
                     agent.neighbors.clear()
                     agent.neighbors.add(coordinator.agent_id)
                     coordinator.neighbors.add(agent.agent_id)
-                    
-                    self.network_graph.add_edge(coordinator.agent_id, agent.agent_id)
         
         elif self.topology == SwarmTopology.SMALL_WORLD:
             # Create small-world network
@@ -1018,9 +1493,6 @@ class SwarmCoordinator:
                     
                     agent.neighbors.add(next_agent.agent_id)
                     agent.neighbors.add(prev_agent.agent_id)
-                    
-                    self.network_graph.add_edge(agent.agent_id, next_agent.agent_id)
-                    self.network_graph.add_edge(agent.agent_id, prev_agent.agent_id)
                 
                 # Add random shortcuts
                 num_shortcuts = len(agents) // 4
@@ -1029,23 +1501,94 @@ class SwarmCoordinator:
                     if agent2.agent_id not in agent1.neighbors:
                         agent1.neighbors.add(agent2.agent_id)
                         agent2.neighbors.add(agent1.agent_id)
-                        self.network_graph.add_edge(agent1.agent_id, agent2.agent_id)
         
         # Notify agents of topology update
         for agent in agents:
-            topology_message = Message(
-                message_id=str(uuid.uuid4()),
-                sender_id="coordinator",
-                receiver_id=agent.agent_id,
-                message_type=MessageType.COORDINATION,
-                content={
-                    'type': 'topology_update',
-                    'neighbors': list(agent.neighbors),
-                    'topology': self.topology.value
-                }
-            )
-            
-            await agent.receive_message(topology_message)
+            await self._notify_topology(agent, {
+                'type': 'topology_update',
+                'neighbors': list(agent.neighbors),
+                'topology': self.topology.value
+            })
+    
+    async def _add_edges_for(self, agent: Agent):
+        """Connect a new agent to every other agent, notifying only the changes"""
+        peers = [peer for peer in self.agents.values() if peer is not agent]
+        
+        agent.neighbors = {peer.agent_id for peer in peers}
+        for peer in peers:
+            peer.neighbors.add(agent.agent_id)
+        
+        # The new agent gets its full neighbor list, everyone else a delta
+        await self._notify_topology(agent, {
+            'type': 'topology_update',
+            'neighbors': list(agent.neighbors),
+            'topology': self.topology.value
+        })
+        delta = {'type': 'topology_delta', 'added': [agent.agent_id], 'removed': []}
+        for peer in peers:
+            await self._notify_topology(peer, delta)
+    
+    async def _remove_edges_for(self, agent_id: str):
+        """Disconnect a removed agent from the remaining agents"""
+        delta = {'type': 'topology_delta', 'added': [], 'removed': [agent_id]}
+        for peer in list(self.agents.values()):
+            peer.neighbors.discard(agent_id)
+            await self._notify_topology(peer, delta)
+    
+    async def _notify_topology(self, agent: Agent, content: Dict[str, Any]):
+        """Deliver a topology message from the coordinator to an agent"""
+        topology_message = Message(
+            message_id=f"coordinator-{next(self._message_sequence)}",
+            sender_id="coordinator",
+            receiver_id=agent.agent_id,
+            message_type=MessageType.COORDINATION,
+            content=content
+        )
+        
+        await agent.receive_message(topology_message)
+    
+    def snapshot_graph(self) -> nx.Graph:
+        """Build a NetworkX graph of the current topology for graph analytics
+        
+        Neighbor sets on the agents are the source of truth; the graph is
+        materialized on demand so topology edits never pay NetworkX costs.
+        """
+        graph = nx.Graph()
+        for agent_id, agent in self.agents.items():
+            graph.add_node(agent_id, agent=agent)
+        graph.add_edges_from(
+            (agent_id, neighbor_id)
+            for agent_id, agent in self.agents.items()
+            for neighbor_id in agent.neighbors
+            if neighbor_id in self.agents and neighbor_id != agent_id
+        )
+        return graph
+    
+    def snapshot_rx_graph(self) -> Tuple['rx.PyGraph', Dict[str, int]]:
+        """Build a rustworkx graph of the current topology
+        
+        Returns the graph and the agent_id -> node index map. Shortest
+        paths, clustering and similar analytics run in native code here,
+        which matters once swarms grow past a few hundred agents.
+        """
+        if not RUSTWORKX_AVAILABLE:
+            raise RuntimeError("rustworkx is not installed; use snapshot_graph()")
+        
+        graph = rx.PyGraph()
+        agent_ids = list(self.agents)
+        node_index = dict(zip(agent_ids, graph.add_nodes_from(agent_ids)))
+        
+        # Neighbor sets are not always symmetric (heartbeats add the sender
+        # on one side only), so collect each undirected edge once from
+        # either end and skip self-loops
+        edges = set()
+        for agent_id, index in node_index.items():
+            for neighbor_id in self.agents[agent_id].neighbors:
+                neighbor_index = node_index.get(neighbor_id)
+                if neighbor_index is not None and neighbor_index != index:
+                    edges.add((min(index, neighbor_index), max(index, neighbor_index)))
+        graph.add_edges_from_no_data(list(edges))
+        return graph, node_index
     
     async def reach_consensus(self, proposal: Dict[str, Any]) -> Dict[str, Any]:
         """Reach consensus among agents"""
@@ -1069,8 +1612,7 @@ class SwarmCoordinator:
         response_times = []
         for agent in active_agents:
             if agent.performance_history:
-                avg_time = np.mean([p['execution_time'] for p in agent.performance_history])
-                response_times.append(avg_time)
+                response_times.append(agent.performance_history.mean_execution_time())
         
         avg_response_time = np.mean(response_times) if response_times else 0
         
@@ -1098,6 +1640,9 @@ class SwarmCoordinator:
         """Optimize swarm performance using swarm intelligence"""
         logger.info("Optimizing swarm performance")
         
+        self._changes_since_optimize = 0
+        self.optimize_event.clear()
+        
         # Particle Swarm Optimization for agent positioning
         await self.swarm_optimizer.optimize_agent_positions(list(self.agents.values()))
         
@@ -1147,19 +1692,38 @@ class MessageBroker:
     def __init__(self):
         self.message_queues = defaultdict(asyncio.Queue)
         self.subscribers = defaultdict(set)
+        
+        # Per-topic snapshot of each subscriber's queue, rebuilt on (un)subscribe
+        self._topic_queues: Dict[str, Tuple[Tuple[str, asyncio.Queue], ...]] = {}
     
-    async def publish(self, topic: str, message: Message):
-        """Publish message to topic"""
-        for subscriber_id in self.subscribers[topic]:
-            await self.message_queues[subscriber_id].put(message)
+    def publish(self, topic: str, message: Message):
+        """Publish message to topic
+        
+        Delivery never blocks, so this is a plain method: every subscriber
+        queue receives the same immutable message via put_nowait, and the
+        sender does not receive its own publication.
+        """
+        sender_id = message.sender_id
+        for subscriber_id, subscriber_queue in self._topic_queues.get(topic, ()):
+            if subscriber_id != sender_id:
+                subscriber_queue.put_nowait(message)
     
     async def subscribe(self, agent_id: str, topic: str):
         """Subscribe agent to topic"""
         self.subscribers[topic].add(agent_id)
+        self._refresh_topic(topic)
     
     async def unsubscribe(self, agent_id: str, topic: str):
         """Unsubscribe agent from topic"""
         self.subscribers[topic].discard(agent_id)
+        self._refresh_topic(topic)
+    
+    def _refresh_topic(self, topic: str):
+        """Rebuild the cached subscriber tuple for a topic"""
+        self._topic_queues[topic] = tuple(
+            (subscriber_id, self.message_queues[subscriber_id])
+            for subscriber_id in self.subscribers[topic]
+        )
     
     async def get_message(self, agent_id: str) -> Optional[Message]:
         """Get message for agent"""
@@ -1168,19 +1732,45 @@ class MessageBroker:
         except asyncio.TimeoutError:
             return None
 
+class MetricTrend:
+    """Running averages of a metric's last 10 samples and of everything before them"""
+    
+    def __init__(self, window: int = 10):
+        self.tail = deque(maxlen=window)
+        self.tail_sum = 0.0
+        self.hist_sum = 0.0
+        self.hist_n = 0
+    
+    def __len__(self) -> int:
+        return len(self.tail) + self.hist_n
+    
+    def append(self, value: float):
+        """Add a sample, moving the oldest tail sample into the history"""
+        if len(self.tail) == self.tail.maxlen:
+            evicted = self.tail[0]
+            self.tail_sum -= evicted
+            self.hist_sum += evicted
+            self.hist_n += 1
+        self.tail.append(value)
+        self.tail_sum += value
+    
+    def recent_average(self) -> float:
+        return self.tail_sum / len(self.tail) if self.tail else 0.0
+    
+    def historical_average(self) -> float:
+        return self.hist_sum / self.hist_n if self.hist_n else self.recent_average()
+
 class MetricsCollector:
     """Collect and analyze swarm metrics"""
     
     def __init__(self):
         self.metrics_history = deque(maxlen=1000)
-        self.performance_data = defaultdict(list)
+        self.performance_data: Dict[str, MetricTrend] = defaultdict(MetricTrend)
     
     def collect_metrics(self, swarm_metrics: SwarmMetrics):
         """Collect swarm metrics"""
-        timestamp = datetime.now()
-        
         self.metrics_history.append({
-            'timestamp': timestamp,
+            'timestamp': time.time_ns(),
             'metrics': swarm_metrics
         })
         
@@ -1195,8 +1785,8 @@ class MetricsCollector:
         
         for metric_name, values in self.performance_data.items():
             if len(values) >= 2:
-                recent_avg = np.mean(values[-10:])  # Last 10 values
-                historical_avg = np.mean(values[:-10]) if len(values) > 10 else recent_avg
+                recent_avg = values.recent_average()  # Last 10 values
+                historical_avg = values.historical_average()
                 
                 trend = 'improving' if recent_avg > historical_avg else 'declining'
                 
@@ -1212,6 +1802,8 @@ class MetricsCollector:
 class SwarmOptimizer:
     """Swarm intelligence optimization algorithms"""
     
+    optimal_distance = 20.0  # Optimal distance between agents
+    
     def __init__(self):
         self.optimization_history = []
     
@@ -1225,8 +1817,10 @@ class SwarmOptimizer:
         dimensions = 2  # 2D positioning
         max_iterations = 50
         
-        # Initialize particles (agent positions)
-        positions = np.array([agent.position for agent in agents])
+        # Initialize particles (agent positions); fitness is measured against
+        # the agents' current positions, which stay fixed during the run
+        base_positions = np.array([agent.position for agent in agents], dtype=np.float64)
+        positions = base_positions.copy()
         velocities = np.random.uniform(-1, 1, (num_particles, dimensions))
         
         # PSO parameters
@@ -1236,40 +1830,39 @@ class SwarmOptimizer:
         
         # Best positions
         personal_best_positions = positions.copy()
-        personal_best_scores = np.array([self._evaluate_position(pos, agents) for pos in positions])
+        personal_best_scores = self._evaluate_positions(positions, base_positions)
         
         global_best_idx = np.argmin(personal_best_scores)
         global_best_position = personal_best_positions[global_best_idx].copy()
         global_best_score = personal_best_scores[global_best_idx]
         
-        # PSO iterations
+        # PSO iterations, every particle updated at once
         for iteration in range(max_iterations):
-            for i in range(num_particles):
-                # Update velocity
-                r1, r2 = np.random.random(2)
-                
-                velocities[i] = (w * velocities[i] +
-                               c1 * r1 * (personal_best_positions[i] - positions[i]) +
-                               c2 * r2 * (global_best_position - positions[i]))
-                
-                # Update position
-                positions[i] += velocities[i]
+            if NUMBA_AVAILABLE:
+                # Native loop over particles, updating the arrays in place
+                pso_step(positions, velocities, personal_best_positions, personal_best_scores,
+                         global_best_position, base_positions, w, c1, c2, self.optimal_distance)
+            else:
+                r1, r2 = np.random.random((2, num_particles, 1))
                 
-                # Bound positions
-                positions[i] = np.clip(positions[i], 0, 100)
+                velocities = (w * velocities +
+                              c1 * r1 * (personal_best_positions - positions) +
+                              c2 * r2 * (global_best_position - positions))
                 
-                # Evaluate new position
-                score = self._evaluate_position(positions[i], agents)
+                # Update and bound positions
+                positions = np.clip(positions + velocities, 0, 100)
                 
-                # Update personal best
-                if score < personal_best_scores[i]:
-                    personal_best_scores[i] = score
-                    personal_best_positions[i] = positions[i].copy()
-                    
-                    # Update global best
-                    if score < global_best_score:
-                        global_best_score = score
-                        global_best_position = positions[i].copy()
+                # Evaluate new positions and update personal bests
+                scores = self._evaluate_positions(positions, base_positions)
+                improved = scores < personal_best_scores
+                personal_best_scores = np.where(improved, scores, personal_best_scores)
+                personal_best_positions = np.where(improved[:, None], positions, personal_best_positions)
+            
+            # Update global best
+            best_idx = np.argmin(personal_best_scores)
+            if personal_best_scores[best_idx] < global_best_score:
+                global_best_score = personal_best_scores[best_idx]
+                global_best_position = personal_best_positions[best_idx].copy()
         
         # Update agent positions
         for i, agent in enumerate(agents):
@@ -1277,26 +1870,23 @@ class SwarmOptimizer:
         
         logger.info(f"Agent positions optimized. Best score: {global_best_score:.4f}")
     
-    def _evaluate_position(self, position: np.ndarray, agents: List[Agent]) -> float:
-        """Evaluate the quality of an agent position"""
+    def _evaluate_positions(self, positions: np.ndarray, base_positions: np.ndarray) -> np.ndarray:
+        """Evaluate the quality of candidate positions (one row each)"""
         # Simple evaluation based on distance to other agents
         # In practice, this would consider communication efficiency, coverage, etc.
-        
-        total_distance = 0
-        for agent in agents:
-            agent_pos = np.array(agent.position)
-            distance = np.linalg.norm(position - agent_pos)
-            total_distance += distance
+        diffs = positions[:, None, :] - base_positions[None, :, :]
+        avg_distance = np.linalg.norm(diffs, axis=2).mean(axis=1)
         
         # Prefer positions that are not too close or too far from other agents
-        avg_distance = total_distance / max(len(agents), 1)
-        optimal_distance = 20.0  # Optimal distance between agents
-        
-        return abs(avg_distance - optimal_distance)
+        return np.abs(avg_distance - self.optimal_distance)
 
 class AutonomousAgentSwarmSystem:
     """Complete autonomous agent swarm system"""
     
+    # Bounds on the time between background optimization passes (seconds)
+    OPTIMIZE_MIN_INTERVAL = 5.0
+    OPTIMIZE_MAX_INTERVAL = 60.0
+    
     def __init__(self, consensus_algorithm: ConsensusAlgorithm = None):
         self.coordinator = SwarmCoordinator(consensus_algorithm)
         self.app = FastAPI(title="Autonomous Agent Swarm System")
@@ -1305,6 +1895,13 @@ class AutonomousAgentSwarmSystem:
         # Background tasks
         self.optimization_task = None
         self.monitoring_task = None
+        self.metrics_task = None
+        
+        # Latest encoded metrics frame shared by all /ws/metrics clients;
+        # the event is replaced after each set so every update wakes them once
+        self._metrics_frame = ""
+        self._metrics_version = 0
+        self._metrics_updated = asyncio.Event()
     
     def _setup_routes(self):
         """Setup FastAPI routes"""
@@ -1315,7 +1912,7 @@ class AutonomousAgentSwarmSystem:
         
         @self.app.get("/swarm/metrics")
         async def get_swarm_metrics():
-            return self.coordinator.get_swarm_metrics().__dict__
+            return asdict(self.coordinator.get_swarm_metrics())
         
         @self.app.get("/swarm/agents")
         async def get_agents():
@@ -1324,7 +1921,7 @@ class AutonomousAgentSwarmSystem:
                     'role': agent.role.value,
                     'is_active': agent.is_active,
                     'current_tasks': len(agent.current_tasks),
-                    'capabilities': agent.capabilities.__dict__,
+                    'capabilities': asdict(agent.capabilities),
                     'position': agent.position,
                     'neighbors': list(agent.neighbors)
                 }
@@ -1398,41 +1995,86 @@ class AutonomousAgentSwarmSystem:
         @self.app.websocket("/ws/metrics")
         async def websocket_metrics(websocket: WebSocket):
             await websocket.accept()
+            if self.metrics_task is None or self.metrics_task.done():
+                self.metrics_task = asyncio.create_task(self._metrics_broadcaster())
+            broadcaster = self.metrics_task
+            
+            # Listening for client frames surfaces a disconnect even while
+            # the metrics stay unchanged and nothing is being sent
+            receiver = asyncio.ensure_future(websocket.receive())
+            waiter = None
             try:
+                version = 0
                 while True:
-                    metrics = self.coordinator.get_swarm_metrics()
-                    await websocket.send_json(metrics.__dict__)
-                    await asyncio.sleep(1)
+                    # Grab the event before comparing versions so an update
+                    # landing in between is not missed
+                    updated = self._metrics_updated
+                    if version != self._metrics_version:
+                        version = self._metrics_version
+                        await websocket.send_text(self._metrics_frame)
+                    
+                    waiter = asyncio.ensure_future(updated.wait())
+                    await asyncio.wait({waiter, receiver, broadcaster},
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    
+                    if receiver.done():
+                        if receiver.result()['type'] == 'websocket.disconnect':
+                            break
+                        # Clients have nothing to say; ignore their frames
+                        receiver = asyncio.ensure_future(websocket.receive())
+                    
+                    # Stop waiting for updates once the broadcaster has ended
+                    if broadcaster.done():
+                        await websocket.close()
+                        break
             except WebSocketDisconnect:
                 pass
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
+            finally:
+                receiver.cancel()
+                if waiter is not None:
+                    waiter.cancel()
     
     async def start(self, num_agents: int = 5):
         """Start the swarm system"""
         logger.info(f"Starting autonomous agent swarm with {num_agents} agents")
         
+        # Draw every agent's attributes in one batch per column; tolist()
+        # hands the dataclasses plain Python scalars
+        rng = np.random.default_rng()
+        skills = ['computation', 'data_processing', 'optimization', 'search']
+        roles = list(AgentRole)
+        
+        cpu_cores = rng.integers(1, 5, num_agents).tolist()
+        memory_gb = rng.uniform(1.0, 8.0, num_agents).tolist()
+        gpu_available = (rng.random(num_agents) > 0.7).tolist()
+        skill_order = rng.random((num_agents, len(skills))).argsort(axis=1)  # per-agent shuffle
+        skill_counts = rng.integers(1, 4, num_agents).tolist()
+        max_tasks = rng.integers(1, 4, num_agents).tolist()
+        reliability = rng.uniform(0.8, 1.0, num_agents).tolist()
+        speed = rng.uniform(0.5, 2.0, num_agents).tolist()
+        role_ids = rng.integers(0, len(roles), num_agents).tolist()
+        
         # Create initial agents
-        for i in range(num_agents):
-            capabilities = AgentCapabilities(
-                cpu_cores=random.randint(1, 4),
-                memory_gb=random.uniform(1.0, 8.0),
-                gpu_available=random.random() > 0.7,
-                specialized_skills=random.sample(['computation', 'data_processing', 'optimization', 'search'], 
-                                               random.randint(1, 3)),
-                max_concurrent_tasks=random.randint(1, 3),
-                reliability_score=random.uniform(0.8, 1.0),
-                processing_speed=random.uniform(0.5, 2.0)
-            )
-            
-            role = random.choice(list(AgentRole))
-            
-            agent = Agent(
+        agents = [
+            Agent(
                 agent_id=f"agent_{i}",
-                role=role,
-                capabilities=capabilities
+                role=roles[role_ids[i]],
+                capabilities=AgentCapabilities(
+                    cpu_cores=cpu_cores[i],
+                    memory_gb=memory_gb[i],
+                    gpu_available=gpu_available[i],
+                    specialized_skills=[skills[j] for j in skill_order[i, :skill_counts[i]]],
+                    max_concurrent_tasks=max_tasks[i],
+                    reliability_score=reliability[i],
+                    processing_speed=speed[i]
+                )
             )
-            
+            for i in range(num_agents)
+        ]
+        
+        for agent in agents:
             await self.coordinator.add_agent(agent)
         
         # Start background optimization
@@ -1447,6 +2089,8 @@ class AutonomousAgentSwarmSystem:
         # Stop background tasks
         if self.optimization_task:
             self.optimization_task.cancel()
+        if self.metrics_task:
+            self.metrics_task.cancel()
         
         # Stop all agents
         for agent_id in list(self.coordinator.agents.keys()):
@@ -1455,15 +2099,52 @@ class AutonomousAgentSwarmSystem:
         logger.info("Autonomous agent swarm stopped")
     
     async def _optimization_loop(self):
-        """Background optimization loop"""
+        """Background optimization loop
+        
+        Runs when the coordinator reports enough changes, at most once per
+        OPTIMIZE_MIN_INTERVAL and at least once per OPTIMIZE_MAX_INTERVAL.
+        """
+        loop = asyncio.get_running_loop()
+        last_run = loop.time()
+        
         while True:
             try:
-                await asyncio.sleep(60)  # Optimize every minute
+                await asyncio.wait_for(self.coordinator.optimize_event.wait(),
+                                       timeout=self.OPTIMIZE_MAX_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            
+            # Debounce bursts of changes
+            delay = last_run + self.OPTIMIZE_MIN_INTERVAL - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            try:
                 await self.coordinator.optimize_swarm()
-            except asyncio.CancelledError:
-                break
             except Exception as e:
                 logger.error(f"Optimization loop error: {e}")
+            last_run = loop.time()
+    
+    async def _metrics_broadcaster(self):
+        """Encode swarm metrics once per second for all websocket clients"""
+        while True:
+            try:
+                metrics = self.coordinator.get_swarm_metrics()
+                if ORJSON_AVAILABLE:
+                    frame = orjson.dumps(metrics, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+                else:
+                    frame = json.dumps(asdict(metrics))
+                
+                # Clients are only woken when the metrics actually changed
+                if frame != self._metrics_frame:
+                    self._metrics_frame = frame
+                    self._metrics_version += 1
+                    updated, self._metrics_updated = self._metrics_updated, asyncio.Event()
+                    updated.set()
+            except Exception as e:
+                logger.error(f"Metrics broadcaster error: {e}")
+            
+            await asyncio.sleep(1)
     
     def start_api_server(self, host: str = "0.0.0.0", port: int = 8000):
         """Start API server"""
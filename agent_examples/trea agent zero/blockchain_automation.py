@@ -20,15 +20,22 @@ import time
 import hashlib
 import hmac
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Any, Union
 from dataclasses import dataclass, field
+from collections import defaultdict, namedtuple
 from decimal import Decimal
 import aiohttp
 import websockets
-from web3 import Web3, HTTPProvider
-from web3.middleware import geth_poa_middleware
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3.middleware import async_geth_poa_middleware
 from eth_account import Account
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
 from eth_typing import Address, HexStr
 import requests
 
@@ -60,6 +67,18 @@ from cryptography.fernet import Fernet
 import jwt
 from passlib.context import CryptContext
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -74,6 +93,43 @@ GAS_PRICE = Gauge('blockchain_gas_price_gwei', 'Current gas price in Gwei')
 PORTFOLIO_VALUE = Gauge('portfolio_value_usd', 'Total portfolio value in USD')
 ARBITRAGE_OPPORTUNITIES = Counter('arbitrage_opportunities_total', 'Arbitrage opportunities found')
 
+# Maximum in-flight price queries per RPC endpoint
+RPC_CONCURRENCY = 8
+
+# Read-only calls issued within this window (seconds) share one JSON-RPC batch
+RPC_BATCH_WINDOW = 0.005
+RPC_BATCH_MAX_SIZE = 20
+
+# An eth_call waiting for its batch: call object and the future for its result
+_PendingCall = namedtuple('_PendingCall', 'payload future')
+
+# Placeholder hash reported by simulated swaps
+_FAKE_TX_HASH = "0x" + bytes(range(32)).hex()
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def portfolio_value(amounts, prices):
+        """Total value of holdings given parallel amount and price arrays"""
+        total = 0.0
+        for i in range(amounts.shape[0]):
+            total += amounts[i] * prices[i]
+        return total
+    
+    @njit(cache=True)
+    def kelly_fraction(win_probability, win_loss_ratio, max_fraction):
+        """Kelly bet fraction clamped to [0, max_fraction]"""
+        fraction = win_probability - (1.0 - win_probability) / win_loss_ratio
+        return max(0.0, min(fraction, max_fraction))
+else:
+    def portfolio_value(amounts, prices):
+        """Total value of holdings given parallel amount and price arrays"""
+        return float(np.dot(amounts, prices))
+    
+    def kelly_fraction(win_probability, win_loss_ratio, max_fraction):
+        """Kelly bet fraction clamped to [0, max_fraction]"""
+        fraction = win_probability - (1.0 - win_probability) / win_loss_ratio
+        return max(0.0, min(fraction, max_fraction))
+
 @dataclass
 class TradingConfig:
     """Configuration for trading strategies"""
@@ -109,6 +165,66 @@ class DeFiProtocol:
     supported_tokens: List[str]
     fee_tier: float
 
+class PortfolioSoA:
+    """Portfolio positions stored column-wise for vectorized valuation"""
+    
+    def __init__(self, capacity: int = 64):
+        self.token_id = np.empty(capacity, dtype=np.int32)
+        self.amount = np.empty(capacity, dtype=np.float64)
+        self.entry_price = np.empty(capacity, dtype=np.float64)
+        self.protocol_id = np.empty(capacity, dtype=np.int8)
+        self.n = 0
+        
+        # Token symbols interned to small ints that index price tables
+        self.tokens: List[str] = []
+        self.token_ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return self.n
+    
+    def intern(self, token: str) -> int:
+        """Return the id for a token symbol, assigning one on first use"""
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            token_id = self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+    
+    def add(self, token: str, amount: float, entry_price: float = 0.0, protocol_id: int = 0) -> int:
+        """Append a position and return its row"""
+        if self.n == self.amount.shape[0]:
+            self._grow()
+        
+        row = self.n
+        self.token_id[row] = self.intern(token)
+        self.amount[row] = amount
+        self.entry_price[row] = entry_price
+        self.protocol_id[row] = protocol_id
+        self.n += 1
+        return row
+    
+    def remove(self, row: int):
+        """Remove a position by moving the last row into its place"""
+        last = self.n - 1
+        for column in (self.token_id, self.amount, self.entry_price, self.protocol_id):
+            column[row] = column[last]
+        self.n = last
+    
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = max(1, 2 * self.amount.shape[0])
+        for name in ('token_id', 'amount', 'entry_price', 'protocol_id'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.n] = column[:self.n]
+            setattr(self, name, grown)
+    
+    def holdings(self) -> Dict[str, float]:
+        """Total amount held per token"""
+        totals = np.bincount(self.token_id[:self.n], weights=self.amount[:self.n],
+                             minlength=len(self.tokens))
+        return {token: float(total) for token, total in zip(self.tokens, totals) if total}
+
 class SecureWallet:
     """Secure wallet management with encryption"""
     
@@ -116,6 +232,9 @@ class SecureWallet:
         self.encryption_key = encryption_key or Fernet.generate_key()
         self.cipher = Fernet(self.encryption_key)
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        
+        # bcrypt releases the GIL, so the async variants run in parallel here
+        self._crypto_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wallet-crypto")
     
     def encrypt_private_key(self, private_key: str, password: str) -> str:
         """Encrypt private key with password"""
@@ -125,18 +244,20 @@ class SecureWallet:
         # Encrypt private key
         encrypted_key = self.cipher.encrypt(private_key.encode())
         
-        # Combine and encode
-        combined = json.dumps({
+        # Combine and encode; orjson produces bytes directly
+        envelope = {
             'encrypted_key': base64.b64encode(encrypted_key).decode(),
             'password_hash': password_hash
-        })
+        }
+        combined = orjson.dumps(envelope) if ORJSON_AVAILABLE else json.dumps(envelope).encode()
         
-        return base64.b64encode(combined.encode()).decode()
+        return base64.b64encode(combined).decode()
     
     def decrypt_private_key(self, encrypted_data: str, password: str) -> str:
         """Decrypt private key with password"""
-        # Decode and parse
-        combined = json.loads(base64.b64decode(encrypted_data).decode())
+        # Decode and parse; both parsers accept the decoded bytes as-is
+        decoded = base64.b64decode(encrypted_data)
+        combined = orjson.loads(decoded) if ORJSON_AVAILABLE else json.loads(decoded)
         
         # Verify password
         if not self.pwd_context.verify(password, combined['password_hash']):
@@ -152,6 +273,23 @@ class SecureWallet:
         """Create new blockchain account"""
         account = Account.create()
         return account.address, account.privateKey.hex()
+    
+    # Async variants keep the deliberately slow bcrypt work off the event loop
+    
+    async def encrypt_private_key_async(self, private_key: str, password: str) -> str:
+        """Encrypt private key with password in the crypto thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._crypto_pool, self.encrypt_private_key, private_key, password)
+    
+    async def decrypt_private_key_async(self, encrypted_data: str, password: str) -> str:
+        """Decrypt private key with password in the crypto thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._crypto_pool, self.decrypt_private_key, encrypted_data, password)
+    
+    async def create_account_async(self) -> Tuple[str, str]:
+        """Create new blockchain account in the crypto thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._crypto_pool, self.create_account)
 
 class BlockchainConnector:
     """Multi-chain blockchain connector"""
@@ -160,19 +298,45 @@ class BlockchainConnector:
         self.config = config
         self.connections = {}
         self.current_network = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._clients: Dict[str, AsyncWeb3] = {}
         self._initialize_connections()
+        
+        # Signing account, derived from the configured key on first use
+        self._account = None
+        
+        # Next nonce per network, counted locally between sends
+        self._next_nonces: Dict[str, int] = {}
+        self._nonce_lock = asyncio.Lock()
     
     def _initialize_connections(self):
-        """Initialize blockchain connections"""
+        """Create an async Web3 client per network; connect() checks them"""
         for network, rpc_url in self.config.networks.items():
             try:
-                w3 = Web3(HTTPProvider(rpc_url))
+                w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
                 
                 # Add PoA middleware for some networks
                 if network in ['bsc', 'polygon']:
-                    w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+                    w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
                 
-                if w3.isConnected():
+                self._clients[network] = w3
+            except Exception as e:
+                logger.error(f"Error connecting to {network}: {e}")
+    
+    async def connect(self):
+        """Open the shared HTTP session and check every network"""
+        # One keep-alive session serves all providers, so RPC calls reuse
+        # connections instead of paying a TCP/TLS handshake each time
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+            )
+        
+        for network, w3 in self._clients.items():
+            try:
+                await w3.provider.cache_async_session(self.session)
+                
+                if await w3.is_connected():
                     self.connections[network] = w3
                     logger.info(f"Connected to {network}")
                 else:
@@ -180,6 +344,11 @@ class BlockchainConnector:
             except Exception as e:
                 logger.error(f"Error connecting to {network}: {e}")
     
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+    
     def switch_network(self, network: str) -> bool:
         """Switch to specified network"""
         if network in self.connections:
@@ -187,26 +356,48 @@ class BlockchainConnector:
             return True
         return False
     
-    def get_web3(self, network: str = None) -> Web3:
+    def get_web3(self, network: str = None) -> AsyncWeb3:
         """Get Web3 instance for network"""
         network = network or self.current_network
         if network not in self.connections:
             raise ValueError(f"Network {network} not available")
         return self.connections[network]
     
-    def get_gas_price(self, network: str = None) -> int:
+    @property
+    def account(self):
+        """Local signing account for the configured private key"""
+        if self._account is None:
+            self._account = Account.from_key(self.config.private_key)
+        return self._account
+    
+    async def next_nonce(self, network: str = None) -> int:
+        """Reserve the next transaction nonce for the configured account"""
+        network = network or self.current_network
+        async with self._nonce_lock:
+            nonce = self._next_nonces.get(network)
+            if nonce is None:
+                w3 = self.get_web3(network)
+                nonce = await w3.eth.get_transaction_count(self.account.address, 'pending')
+            self._next_nonces[network] = nonce + 1
+            return nonce
+    
+    def reset_nonce(self, network: str = None):
+        """Forget the local nonce so the next send resyncs with the node"""
+        self._next_nonces.pop(network or self.current_network, None)
+    
+    async def get_gas_price(self, network: str = None) -> int:
         """Get current gas price"""
         w3 = self.get_web3(network)
-        gas_price = w3.eth.gas_price
-        gas_price_gwei = w3.fromWei(gas_price, 'gwei')
+        gas_price = await w3.eth.gas_price
+        gas_price_gwei = w3.from_wei(gas_price, 'gwei')
         
         GAS_PRICE.set(gas_price_gwei)
         return gas_price_gwei
     
-    def estimate_gas(self, transaction: Dict, network: str = None) -> int:
+    async def estimate_gas(self, transaction: Dict, network: str = None) -> int:
         """Estimate gas for transaction"""
         w3 = self.get_web3(network)
-        return w3.eth.estimate_gas(transaction)
+        return await w3.eth.estimate_gas(transaction)
 
 class SmartContractManager:
     """Smart contract deployment and interaction"""
@@ -215,20 +406,66 @@ class SmartContractManager:
         self.blockchain = blockchain_connector
         self.contracts = {}
         self.abis = {}
+        
+        # (contract_key, function_name) -> (function, selector, input types,
+        # output types); dropped when the contract is reloaded with a new ABI
+        self._fn_cache: Dict[Tuple[str, str], Tuple[Any, str, List[str], List[str]]] = {}
+        
+        # Per-network eth_call batching queues and their flusher tasks
+        self._batch_queues: Dict[str, asyncio.Queue] = {}
+        self._batch_flushers: Dict[str, asyncio.Task] = {}
     
     def load_contract(self, address: str, abi: List[Dict], network: str = None) -> Any:
         """Load existing contract"""
+        contract_key = f"{network or self.blockchain.current_network}:{address}"
+        
+        # Reloading with the same ABI keeps the contract and its cached functions
+        old_abi = self.abis.get(contract_key)
+        if old_abi is not None:
+            if old_abi == abi:
+                return self.contracts[contract_key]
+            for entry in old_abi:
+                if entry.get('type') == 'function':
+                    self._fn_cache.pop((contract_key, entry['name']), None)
+        
         w3 = self.blockchain.get_web3(network)
         contract = w3.eth.contract(address=address, abi=abi)
         
-        contract_key = f"{network or self.blockchain.current_network}:{address}"
         self.contracts[contract_key] = contract
         self.abis[contract_key] = abi
         
         return contract
     
-    def deploy_contract(self, bytecode: str, abi: List[Dict], 
-                       constructor_args: List = None, network: str = None) -> str:
+    def _function_entry(self, contract_key: str, function_name: str) -> Tuple[Any, str, List[str], List[str]]:
+        """Return the cached function, selector and ABI types for a contract function"""
+        key = (contract_key, function_name)
+        entry = self._fn_cache.get(key)
+        if entry is None:
+            # The unbound ContractFunction carries no ABI until it is called,
+            # so resolve the function's ABI entry by name from the contract ABI
+            matches = [
+                item for item in self.abis[contract_key]
+                if item.get('type') == 'function' and item.get('name') == function_name
+            ]
+            if not matches:
+                raise ValueError(f"Function {function_name} not found in contract ABI: {contract_key}")
+            if len(matches) > 1:
+                raise ValueError(f"Function {function_name} is overloaded; overloads are not supported: {contract_key}")
+            
+            abi = matches[0]
+            function = getattr(self.contracts[contract_key].functions, function_name)
+            entry = self._fn_cache[key] = (
+                function,
+                '0x' + function_abi_to_4byte_selector(abi).hex(),
+                # Struct parameters are "tuple" in the ABI; eth_abi needs
+                # the expanded "(type,...)" form
+                [collapse_if_tuple(param) for param in abi['inputs']],
+                [collapse_if_tuple(param) for param in abi['outputs']]
+            )
+        return entry
+    
+    async def deploy_contract(self, bytecode: str, abi: List[Dict], 
+                             constructor_args: List = None, network: str = None) -> str:
         """Deploy new contract"""
         w3 = self.blockchain.get_web3(network)
         
@@ -238,42 +475,162 @@ class SmartContractManager:
         # Build constructor transaction
         constructor = contract.constructor(*(constructor_args or []))
         
-        # Get account
-        account = Account.from_key(self.blockchain.config.private_key)
-        
         # Build transaction
-        transaction = constructor.buildTransaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
+        transaction = await constructor.build_transaction({
+            'from': self.blockchain.account.address,
             'gas': 2000000,
-            'gasPrice': w3.eth.gas_price
+            'gasPrice': await w3.eth.gas_price
         })
         
         # Sign and send transaction
-        signed_txn = w3.eth.account.sign_transaction(transaction, self.blockchain.config.private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        tx_hash = await self._sign_and_send(w3, transaction, network)
         
         # Wait for receipt
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await w3.eth.wait_for_transaction_receipt(tx_hash)
         
         logger.info(f"Contract deployed at {receipt.contractAddress}")
         return receipt.contractAddress
     
-    def call_function(self, contract_address: str, function_name: str, 
-                     args: List = None, network: str = None) -> Any:
+    async def _sign_and_send(self, w3: AsyncWeb3, transaction: Dict, network: str = None) -> bytes:
+        """Reserve a nonce, sign with the cached account and send
+        
+        The nonce is taken as the last step before signing, and any failure
+        from there on resyncs the local counter with the node.
+        """
+        transaction['nonce'] = await self.blockchain.next_nonce(network)
+        try:
+            signed_txn = self.blockchain.account.sign_transaction(transaction)
+            return await w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception:
+            # The reserved nonce went unused; fetch it from the node next time
+            self.blockchain.reset_nonce(network)
+            raise
+    
+    async def call_function(self, contract_address: str, function_name: str, 
+                           args: List = None, network: str = None) -> Any:
         """Call contract function (read-only)"""
         contract_key = f"{network or self.blockchain.current_network}:{contract_address}"
         
         if contract_key not in self.contracts:
             raise ValueError(f"Contract not loaded: {contract_address}")
         
-        contract = self.contracts[contract_key]
-        function = getattr(contract.functions, function_name)
+        function, selector, input_types, output_types = self._function_entry(contract_key, function_name)
         
-        return function(*(args or [])).call()
-    
-    def send_transaction(self, contract_address: str, function_name: str,
-                        args: List = None, value: int = 0, network: str = None) -> str:
+        session = self.blockchain.session
+        if session is None or session.closed:
+            return await function(*(args or [])).call()
+        
+        # Queue the call for the network's next JSON-RPC batch; only the
+        # arguments are encoded per call
+        network = contract_key.split(':', 1)[0]
+        payload = {
+            'to': self.contracts[contract_key].address,
+            'data': selector + abi_encode(input_types, args or []).hex()
+        }
+        future = asyncio.get_running_loop().create_future()
+        self._batch_queue(network).put_nowait(_PendingCall(payload, future))
+        result = await future
+        
+        # Decode and normalize like ContractFunction.call() (e.g. checksummed
+        # addresses), so results match the direct path; single outputs are unwrapped
+        decoded = abi_decode(output_types, bytes.fromhex(result[2:]))
+        normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+        return normalized[0] if len(normalized) == 1 else list(normalized)
+    
+    def _batch_queue(self, network: str) -> asyncio.Queue:
+        """Return the batching queue for a network, starting its flusher"""
+        flusher = self._batch_flushers.get(network)
+        if flusher is None or flusher.done():
+            # A restarted flusher keeps the existing queue, so calls queued
+            # before the previous one stopped are still sent
+            self._batch_queues.setdefault(network, asyncio.Queue())
+            self._batch_flushers[network] = asyncio.create_task(self._batch_flusher(network))
+        return self._batch_queues[network]
+    
+    async def _batch_flusher(self, network: str):
+        """Send queued eth_calls for a network as JSON-RPC batch requests"""
+        queue = self._batch_queues[network]
+        
+        while True:
+            batch = [await queue.get()]
+            
+            try:
+                # Give concurrent callers one window to join unless the batch is full
+                if queue.qsize() < RPC_BATCH_MAX_SIZE - 1:
+                    await asyncio.sleep(RPC_BATCH_WINDOW)
+                while len(batch) < RPC_BATCH_MAX_SIZE and not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                await self._send_batch(network, batch)
+            except Exception as e:
+                logger.error(f"Batch flush error on {network}: {e}")
+                self._fail_pending(batch, e)
+            finally:
+                # Nothing in a batch that was taken off the queue may be left waiting
+                for call in batch:
+                    if not call.future.done():
+                        call.future.cancel()
+    
+    async def _send_batch(self, network: str, batch: List[_PendingCall]):
+        """POST one batch and resolve each pending call by its request id"""
+        request = [
+            {'jsonrpc': '2.0', 'id': i, 'method': 'eth_call', 'params': [call.payload, 'latest']}
+            for i, call in enumerate(batch)
+        ]
+        
+        try:
+            async with self.blockchain.session.post(self.blockchain.config.networks[network],
+                                                    json=request) as response:
+                replies = await response.json(content_type=None)
+        except Exception as e:
+            self._fail_pending(batch, e)
+            return
+        
+        # A node that rejects the whole batch answers with a single object;
+        # anything that is not a reply object is ignored
+        if isinstance(replies, dict):
+            replies = [replies]
+        if not isinstance(replies, list):
+            self._fail_pending(batch, ValueError(f"Malformed batch response from {network}"))
+            return
+        replies_by_id = {reply.get('id'): reply for reply in replies if isinstance(reply, dict)}
+        
+        try:
+            for i, call in enumerate(batch):
+                if call.future.done():  # caller was cancelled
+                    continue
+                
+                reply = replies_by_id.get(i)
+                if reply is None:
+                    call.future.set_exception(ValueError(f"No reply for batched call on {network}"))
+                elif 'error' in reply:
+                    error = reply['error']
+                    message = error.get('message', error) if isinstance(error, dict) else error
+                    call.future.set_exception(ValueError(message))
+                else:
+                    call.future.set_result(reply['result'])
+        except Exception as e:
+            self._fail_pending(batch, e)
+    
+    @staticmethod
+    def _fail_pending(batch: List[_PendingCall], error: Exception):
+        """Fail every call in a batch that is still waiting for its result"""
+        for call in batch:
+            if not call.future.done():
+                call.future.set_exception(error)
+    
+    async def close(self):
+        """Stop the batch flushers and cancel calls still queued"""
+        for flusher in self._batch_flushers.values():
+            flusher.cancel()
+        self._batch_flushers.clear()
+        
+        for queue in self._batch_queues.values():
+            while not queue.empty():
+                queue.get_nowait().future.cancel()
+    
+    async def send_transaction(self, contract_address: str, function_name: str,
+                              args: List = None, value: int = 0, network: str = None) -> str:
         """Send transaction to contract"""
         w3 = self.blockchain.get_web3(network)
         contract_key = f"{network or self.blockchain.current_network}:{contract_address}"
@@ -281,24 +638,18 @@ class SmartContractManager:
         if contract_key not in self.contracts:
             raise ValueError(f"Contract not loaded: {contract_address}")
         
-        contract = self.contracts[contract_key]
-        function = getattr(contract.functions, function_name)
-        
-        # Get account
-        account = Account.from_key(self.blockchain.config.private_key)
+        function = self._function_entry(contract_key, function_name)[0]
         
         # Build transaction
-        transaction = function(*(args or [])).buildTransaction({
-            'from': account.address,
+        transaction = await function(*(args or [])).build_transaction({
+            'from': self.blockchain.account.address,
             'value': value,
-            'nonce': w3.eth.get_transaction_count(account.address),
             'gas': 200000,
-            'gasPrice': w3.eth.gas_price
+            'gasPrice': await w3.eth.gas_price
         })
         
         # Sign and send
-        signed_txn = w3.eth.account.sign_transaction(transaction, self.blockchain.config.private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        tx_hash = await self._sign_and_send(w3, transaction, network)
         
         logger.info(f"Transaction sent: {tx_hash.hex()}")
         return tx_hash.hex()
@@ -311,9 +662,14 @@ class DeFiTrader:
         self.blockchain = blockchain_connector
         self.contracts = contract_manager
         self.config = config
-        self.portfolio = {}
+        self.portfolio = PortfolioSoA()
         self.active_positions = {}
         
+        # One limiter per network so concurrent price scans don't flood an endpoint
+        self._rpc_limits: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(RPC_CONCURRENCY)
+        )
+        
         # Initialize DeFi protocols
         self.protocols = {
             'uniswap_v3': DeFiProtocol(
@@ -339,12 +695,21 @@ class DeFiTrader:
         """Execute arbitrage between protocols"""
         token_a, token_b = token_pair
         
-        # Get prices from different protocols
-        prices = {}
-        for protocol_name in protocols:
-            protocol = self.protocols[protocol_name]
-            price = await self._get_token_price(token_a, token_b, protocol)
-            prices[protocol_name] = price
+        # Get prices from different protocols concurrently
+        results = await asyncio.gather(
+            *(self._get_token_price(token_a, token_b, self.protocols[protocol_name])
+              for protocol_name in protocols),
+            return_exceptions=True
+        )
+        
+        # Failed lookups (exceptions or a 0.0 price) can't take part
+        prices = {
+            protocol_name: price
+            for protocol_name, price in zip(protocols, results)
+            if not isinstance(price, BaseException) and price > 0
+        }
+        if len(prices) < 2:
+            return None
         
         # Find arbitrage opportunity
         min_price_protocol = min(prices, key=prices.get)
@@ -376,8 +741,8 @@ class DeFiTrader:
     async def _get_token_price(self, token_a: str, token_b: str, 
                               protocol: DeFiProtocol) -> float:
         """Get token price from protocol"""
-        # Switch to protocol network
-        self.blockchain.switch_network(protocol.network)
+        # The network is passed explicitly so concurrent lookups on different
+        # networks don't race on the connector's current network
         
         # Load router contract (simplified)
         router_abi = [
@@ -410,9 +775,10 @@ class DeFiTrader:
         amount_in = 10**18  # 1 token
         
         try:
-            amounts_out = self.contracts.call_function(
-                protocol.router_address, 'getAmountsOut', [amount_in, path], protocol.network
-            )
+            async with self._rpc_limits[protocol.network]:
+                amounts_out = await self.contracts.call_function(
+                    protocol.router_address, 'getAmountsOut', [amount_in, path], protocol.network
+                )
             return amounts_out[1] / amount_in
         except Exception as e:
             logger.error(f"Error getting price from {protocol.name}: {e}")
@@ -424,13 +790,9 @@ class DeFiTrader:
         win_probability = 0.7  # Estimated based on historical data
         win_loss_ratio = profit_percentage / self.config.stop_loss
         
-        kelly_fraction = win_probability - (1 - win_probability) / win_loss_ratio
-        kelly_fraction = max(0, min(kelly_fraction, self.config.max_position_size))
+        fraction = kelly_fraction(win_probability, win_loss_ratio, self.config.max_position_size)
         
-        # Get portfolio value
-        portfolio_value = self._get_portfolio_value()
-        
-        return portfolio_value * kelly_fraction
+        return self._get_portfolio_value() * fraction
     
     async def _execute_arbitrage_trade(self, token_pair: Tuple[str, str], 
                                       trade_size: float, buy_protocol: str, 
@@ -476,7 +838,7 @@ class DeFiTrader:
         self.blockchain.switch_network(protocol.network)
         
         # Check gas price
-        gas_price = self.blockchain.get_gas_price(protocol.network)
+        gas_price = await self.blockchain.get_gas_price(protocol.network)
         if gas_price > self.config.max_gas_price:
             return {'success': False, 'error': 'Gas price too high'}
         
@@ -484,11 +846,9 @@ class DeFiTrader:
         try:
             # This would involve calling the actual swap function
             # For now, simulate successful swap
-            tx_hash = f"0x{''.join([f'{i:02x}' for i in range(32)])}"
-            
             return {
                 'success': True,
-                'tx_hash': tx_hash,
+                'tx_hash': _FAKE_TX_HASH,
                 'amount_out': amount * 0.997,  # Minus fees
                 'gas_used': 150000
             }
@@ -498,12 +858,15 @@ class DeFiTrader:
     
     def _get_portfolio_value(self) -> float:
         """Get total portfolio value in USD"""
-        total_value = 0.0
+        portfolio = self.portfolio
+        n = portfolio.n
         
-        for token, amount in self.portfolio.items():
-            # Get token price in USD (simplified)
-            price_usd = self._get_token_price_usd(token)
-            total_value += amount * price_usd
+        # Get token prices in USD (simplified), once per token rather than
+        # once per position
+        price_table = np.fromiter(map(self._get_token_price_usd, portfolio.tokens),
+                                  np.float64, len(portfolio.tokens))
+        
+        total_value = portfolio_value(portfolio.amount[:n], price_table[portfolio.token_id[:n]])
         
         PORTFOLIO_VALUE.set(total_value)
         return total_value
@@ -614,11 +977,11 @@ class NFTAutomation:
     async def _execute_mint(self, contract_address: str, config: Dict) -> str:
         """Execute mint transaction"""
         # Calculate optimal gas price for fast confirmation
-        base_gas = self.blockchain.get_gas_price()
+        base_gas = await self.blockchain.get_gas_price()
         priority_gas = base_gas * 1.2  # 20% above base
         
         # Execute mint transaction with high gas
-        tx_hash = self.contracts.send_transaction(
+        tx_hash = await self.contracts.send_transaction(
             contract_address,
             'mint',
             [config.get('quantity', 1)],
@@ -731,7 +1094,7 @@ class YieldFarmingOptimizer:
     
     async def _estimate_compound_gas_cost(self, position: Dict) -> float:
         """Estimate gas cost for compounding"""
-        gas_price = self.blockchain.get_gas_price()
+        gas_price = await self.blockchain.get_gas_price()
         gas_limit = 200000  # Estimated gas limit
         
         eth_price = 2000  # Get from price feed
@@ -932,6 +1295,8 @@ class BlockchainAutomationSystem:
         self.running = True
         logger.info("Starting blockchain automation system")
         
+        await self.blockchain.connect()
+        
         # Start monitoring tasks
         tasks = [
             asyncio.create_task(self._arbitrage_monitor()),
@@ -947,6 +1312,8 @@ class BlockchainAutomationSystem:
             logger.error(f"System error: {e}")
         finally:
             self.running = False
+            await self.contracts.close()
+            await self.blockchain.close()
     
     async def _arbitrage_monitor(self):
         """Monitor for arbitrage opportunities"""
@@ -1012,7 +1379,7 @@ class BlockchainAutomationSystem:
         while self.running:
             try:
                 # Get current portfolio
-                portfolio = self.trader.portfolio
+                portfolio = self.trader.portfolio.holdings()
                 
                 if portfolio:
                     risk_metrics = await self.risk_manager.monitor_portfolio_risk(portfolio)
@@ -1031,7 +1398,7 @@ class BlockchainAutomationSystem:
         while self.running:
             try:
                 # Check if rebalancing is needed
-                portfolio = self.trader.portfolio
+                portfolio = self.trader.portfolio.holdings()
                 
                 if self._needs_rebalancing(portfolio):
                     await self._execute_rebalancing(portfolio)